@@ -0,0 +1,116 @@
+# dashboard_helpers.py
+# Streamlit-free helpers for streamlit_app.py. Kept in an imported module so they are
+# defined once per process rather than on every script rerun, and can be tested directly.
+
+import io
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels fall back to NumPy reductions
+    njit = None
+
+# Checklist flag for a blank cell (1 met, 0 not met); flags are uint8.
+REQUIREMENT_FLAG_BLANK = 255
+
+
+# ---------------- Export serializers ----------------
+def _without_attrs(df):
+    # attrs carry loader metadata, not export content; Arrow / pandas would also JSON-encode
+    # them into the file metadata, failing on anything that isn't JSON-serializable.
+    export = df.copy(deep=False)
+    export.attrs = {}
+    return export
+
+def convert_df_to_csv(df_to_convert):
+    # Arrow's multithreaded C++ writer emits UTF-8 directly; pandas' writer is the fallback for
+    # any column type Arrow can't convert or write (e.g. mixed-type object columns).
+    try:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(pa.Table.from_pandas(_without_attrs(df_to_convert), preserve_index=False), sink)
+        return sink.getvalue().to_pybytes()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        return df_to_convert.to_csv(index=False).encode('utf-8')
+
+def convert_df_to_parquet(df_to_convert):
+    buf = io.BytesIO()
+    _without_attrs(df_to_convert).to_parquet(buf, engine='pyarrow', compression='snappy', index=False)
+    return buf.getvalue()
+
+
+# ---------------- NumPy / Numba kernels ----------------
+# Module level, so each njit dispatcher is created (and compiled or loaded from cache) once
+# per process instead of on every script rerun.
+def metrics_numpy(confirmed, score, days):
+    total = confirmed.shape[0]
+    success_rate = confirmed.sum() / total * 100.0 if total > 0 else 0.0
+    score_ok = ~np.isnan(score); days_ok = ~np.isnan(days)
+    avg_score = score[score_ok].mean() if score_ok.any() else np.nan
+    avg_days = days[days_ok].mean() if days_ok.any() else np.nan
+    return total, success_rate, avg_score, avg_days
+
+if njit is not None:
+    @njit(cache=True)
+    def metrics_kernel(confirmed, score, days):
+        # Single fused pass: confirmed count plus NaN-skipping sums for score and days
+        total = confirmed.shape[0]
+        n_conf = 0; score_sum = 0.0; score_n = 0; days_sum = 0.0; days_n = 0
+        for i in range(total):
+            if confirmed[i]:
+                n_conf += 1
+            if not np.isnan(score[i]):
+                score_sum += score[i]; score_n += 1
+            if not np.isnan(days[i]):
+                days_sum += days[i]; days_n += 1
+        success_rate = n_conf / total * 100.0 if total > 0 else 0.0
+        avg_score = score_sum / score_n if score_n > 0 else np.nan
+        avg_days = days_sum / days_n if days_n > 0 else np.nan
+        return total, success_rate, avg_score, avg_days
+else:
+    metrics_kernel = metrics_numpy
+
+def completion_numpy(flags, confirmed):
+    sub = flags[confirmed]
+    return (sub == 1).sum(axis=0), (sub != REQUIREMENT_FLAG_BLANK).sum(axis=0)
+
+if njit is not None:
+    @njit(cache=True)
+    def completion_kernel(flags, confirmed):
+        # Per-requirement met / non-blank counts over confirmed rows, without copying the subset
+        n_rows, n_cols = flags.shape
+        met = np.zeros(n_cols, dtype=np.int64); valid = np.zeros(n_cols, dtype=np.int64)
+        for i in range(n_rows):
+            if confirmed[i]:
+                for j in range(n_cols):
+                    v = flags[i, j]
+                    if v == 1:
+                        met[j] += 1
+                    if v != REQUIREMENT_FLAG_BLANK:
+                        valid[j] += 1
+        return met, valid
+else:
+    completion_kernel = completion_numpy
+
+def category_mask_numpy(codes, bits, mask):
+    # bits[j, code + 1] is 1 when filter j keeps that code; column 0 is the missing code -1
+    for j in range(codes.shape[1]):
+        mask &= bits[j][codes[:, j] + 1].astype(bool)
+    return mask
+
+if njit is not None:
+    @njit(cache=True)
+    def category_mask_kernel(codes, bits, mask):
+        # One pass over the rows ANDs every category filter into mask, with no temporaries
+        n_rows, n_cols = codes.shape
+        for i in range(n_rows):
+            if mask[i]:
+                for j in range(n_cols):
+                    if bits[j, codes[i, j] + 1] == 0:
+                        mask[i] = False
+                        break
+        return mask
+else:
+    category_mask_kernel = category_mask_numpy
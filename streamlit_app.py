@@ -6,12 +6,27 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import numpy as np
 import re
+import hashlib
+import logging
+from collections import namedtuple
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from dashboard_helpers import (REQUIREMENT_FLAG_BLANK, category_mask_kernel, completion_kernel,
+                               convert_df_to_csv, convert_df_to_parquet, metrics_kernel)
 from dateutil import tz
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # public only from pandas 2.2; same function lives here on 2.0/2.1
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+logger = logging.getLogger(__name__)
+
 # ---------------- Page Config ----------------
 st.set_page_config(
     page_title="Onboarding Analytics Dashboard",
@@ -21,9 +36,49 @@ st.set_page_config(
 )
 
 # ---------------- Styling ----------------
-def load_custom_css():
-    THEME = st.get_option("theme.base")
-    if THEME == "light":
+# Theme-independent rules; colours come from the :root variables emitted by theme_css_vars().
+STATIC_CSS = """
+    <style>
+        body { font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
+        .stApp { padding: 0.5rem 1rem; }
+        h1, h2, h3, h4, h5, h6 { font-weight: 600; color: var(--primary-color); }
+        h1 { text-align: center; padding: 0.8em 0.5em; font-size: 2.3rem; letter-spacing: 0.5px; border-bottom: 2px solid var(--primary-color); margin-bottom: 1.5em; font-weight: 700; }
+        h2 { font-size: 1.7rem; margin-top: 2.2em; margin-bottom: 1.3em; padding-bottom: 0.5em; border-bottom: 1px solid var(--border-color); font-weight: 600; }
+        h3 { font-size: 1.4rem; margin-top: 2em; margin-bottom: 1.1em; font-weight: 600; color: var(--text-color); opacity: 0.9; }
+        h5 { color: var(--text-color); opacity: 0.95; margin-top: 1.8em; margin-bottom: 0.9em; font-weight: 500; letter-spacing: 0.1px; font-size: 1.1rem; }
+        .custom-table-container { overflow-x: auto; border: 1px solid var(--table-border-color); border-radius: 10px; max-height: 500px; }
+        .custom-styled-table { width: 100%; border-collapse: collapse; font-size: var(--table-font-size); }
+        .custom-styled-table th, .custom-styled-table td { padding: var(--table-cell-padding); text-align: left; border-bottom: 1px solid var(--table-border-color); border-right: 1px solid var(--table-border-color); white-space: nowrap; }
+        .custom-styled-table th { background-color: var(--table-header-bg); position: sticky; top: 0; z-index: 2; }
+        .custom-styled-table tbody tr:hover { background-color: color-mix(in srgb, var(--secondary-background-color) 75%, var(--primary-color) 8%); }
+        .cell-score-good { background-color: var(--score-good-bg); color: var(--score-good-text); }
+        .cell-score-medium { background-color: var(--score-medium-bg); color: var(--score-medium-text); }
+        .cell-score-bad { background-color: var(--score-bad-bg); color: var(--score-bad-text); }
+        .cell-sentiment-positive { background-color: var(--sentiment-positive-bg); color: var(--sentiment-positive-text); }
+        .cell-sentiment-neutral { background-color: var(--sentiment-neutral-bg); color: var(--sentiment-neutral-text); }
+        .cell-sentiment-negative { background-color: var(--sentiment-negative-bg); color: var(--sentiment-negative-text); }
+        .cell-days-good { background-color: var(--days-good-bg); color: var(--days-good-text); }
+        .cell-days-medium { background-color: var(--days-medium-bg); color: var(--days-medium-text); }
+        .cell-days-bad { background-color: var(--days-bad-bg); color: var(--days-bad-text); }
+        .cell-req-met { background-color: var(--req-met-bg); color: var(--req-met-text); }
+        .cell-req-not-met { background-color: var(--req-not-met-bg); color: var(--req-not-met-text); }
+        .cell-req-na { background-color: var(--req-na-bg); color: var(--req-na-text); }
+        .login-container { display: flex; justify-content: center; align-items: center; min-height: 60vh; flex-direction: column; text-align: center; padding: 1em; }
+        .login-box { background-color: var(--login-box-bg); padding: 2.5em 3em; border-radius: 15px; box-shadow: var(--login-box-shadow); max-width: 450px; width: 100%; }
+        @media (max-width: 768px) {
+            h1 { font-size: 1.8rem; }
+            .custom-styled-table th, .custom-styled-table td { white-space: normal; }
+        }
+        @media (max-width: 480px) {
+            h1 { font-size: 1.5rem; }
+        }
+    </style>
+"""
+
+@st.cache_data(show_spinner=False)
+def theme_css_vars(theme):
+    """The small theme-dependent :root block; built once per theme instead of every rerun."""
+    if theme == "light":
         SCORE_GOOD_BG = "#DFF0D8"; SCORE_GOOD_TEXT = "#3C763D"
         SCORE_MEDIUM_BG = "#FCF8E3"; SCORE_MEDIUM_TEXT = "#8A6D3B"
         SCORE_BAD_BG = "#F2DEDE"; SCORE_BAD_TEXT = "#A94442"
@@ -71,7 +126,7 @@ def load_custom_css():
     TABLE_CELL_PADDING = "0.65em 0.8em"
     TABLE_FONT_SIZE = "0.92rem"
 
-    css = f"""
+    return f"""
     <style>
         :root {{
             --score-good-bg: {SCORE_GOOD_BG}; --score-good-text: {SCORE_GOOD_TEXT};
@@ -94,42 +149,11 @@ def load_custom_css():
             --logout-btn-border: {LOGOUT_BTN_BORDER}; --logout-btn-hover-bg: {LOGOUT_BTN_HOVER_BG};
             --primary-btn-bg: {PRIMARY_BTN_BG}; --primary-btn-hover-bg: {PRIMARY_BTN_HOVER_BG};
         }}
-        body {{ font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }}
-        .stApp {{ padding: 0.5rem 1rem; }}
-        h1, h2, h3, h4, h5, h6 {{ font-weight: 600; color: var(--primary-color); }}
-        h1 {{ text-align: center; padding: 0.8em 0.5em; font-size: 2.3rem; letter-spacing: 0.5px; border-bottom: 2px solid var(--primary-color); margin-bottom: 1.5em; font-weight: 700; }}
-        h2 {{ font-size: 1.7rem; margin-top: 2.2em; margin-bottom: 1.3em; padding-bottom: 0.5em; border-bottom: 1px solid var(--border-color); font-weight: 600; }}
-        h3 {{ font-size: 1.4rem; margin-top: 2em; margin-bottom: 1.1em; font-weight: 600; color: var(--text-color); opacity: 0.9; }}
-        h5 {{ color: var(--text-color); opacity: 0.95; margin-top: 1.8em; margin-bottom: 0.9em; font-weight: 500; letter-spacing: 0.1px; font-size: 1.1rem; }}
-        .custom-table-container {{ overflow-x: auto; border: 1px solid var(--table-border-color); border-radius: 10px; max-height: 500px; }}
-        .custom-styled-table {{ width: 100%; border-collapse: collapse; font-size: var(--table-font-size); }}
-        .custom-styled-table th, .custom-styled-table td {{ padding: var(--table-cell-padding); text-align: left; border-bottom: 1px solid var(--table-border-color); border-right: 1px solid var(--table-border-color); white-space: nowrap; }}
-        .custom-styled-table th {{ background-color: var(--table-header-bg); position: sticky; top: 0; z-index: 2; }}
-        .custom-styled-table tbody tr:hover {{ background-color: color-mix(in srgb, var(--secondary-background-color) 75%, var(--primary-color) 8%); }}
-        .cell-score-good {{ background-color: var(--score-good-bg); color: var(--score-good-text); }}
-        .cell-score-medium {{ background-color: var(--score-medium-bg); color: var(--score-medium-text); }}
-        .cell-score-bad {{ background-color: var(--score-bad-bg); color: var(--score-bad-text); }}
-        .cell-sentiment-positive {{ background-color: var(--sentiment-positive-bg); color: var(--sentiment-positive-text); }}
-        .cell-sentiment-neutral {{ background-color: var(--sentiment-neutral-bg); color: var(--sentiment-neutral-text); }}
-        .cell-sentiment-negative {{ background-color: var(--sentiment-negative-bg); color: var(--sentiment-negative-text); }}
-        .cell-days-good {{ background-color: var(--days-good-bg); color: var(--days-good-text); }}
-        .cell-days-medium {{ background-color: var(--days-medium-bg); color: var(--days-medium-text); }}
-        .cell-days-bad {{ background-color: var(--days-bad-bg); color: var(--days-bad-text); }}
-        .cell-req-met {{ background-color: var(--req-met-bg); color: var(--req-met-text); }}
-        .cell-req-not-met {{ background-color: var(--req-not-met-bg); color: var(--req-not-met-text); }}
-        .cell-req-na {{ background-color: var(--req-na-bg); color: var(--req-na-text); }}
-        .login-container {{ display: flex; justify-content: center; align-items: center; min-height: 60vh; flex-direction: column; text-align: center; padding: 1em; }}
-        .login-box {{ background-color: var(--login-box-bg); padding: 2.5em 3em; border-radius: 15px; box-shadow: var(--login-box-shadow); max-width: 450px; width: 100%; }}
-        @media (max-width: 768px) {{
-            h1 {{ font-size: 1.8rem; }}
-            .custom-styled-table th, .custom-styled-table td {{ white-space: normal; }}
-        }}
-        @media (max-width: 480px) {{
-            h1 {{ font-size: 1.5rem; }}
-        }}
     </style>
     """
-    st.markdown(css, unsafe_allow_html=True)
+
+def load_custom_css():
+    st.markdown(theme_css_vars(st.get_option("theme.base")) + STATIC_CSS, unsafe_allow_html=True)
 
 load_custom_css()
 
@@ -149,6 +173,63 @@ ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS = [
     'scheduleTrainingAndPromo', 'providePromoCreditLink', 'expectationsSet'
 ]
 ORDERED_CHART_REQUIREMENTS = ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS
+# Per-requirement uint8 flags built at load time: 1 met, 0 not met, REQUIREMENT_FLAG_BLANK blank.
+REQUIREMENT_FLAG_COLS = [f"{c}_flag" for c in ORDERED_CHART_REQUIREMENTS]
+# Index forms of the above, so column-presence checks are one vectorized isin
+REQUIREMENT_INDEX = pd.Index(ORDERED_CHART_REQUIREMENTS)
+REQUIREMENT_FLAG_INDEX = pd.Index(REQUIREMENT_FLAG_COLS)
+# Lower-cased checklist cell spellings that count as met / explicitly not met
+REQUIREMENT_MET_VALUES = frozenset({'true', '1', 'yes', 'x', 'completed', 'done'})
+REQUIREMENT_NOT_MET_VALUES = frozenset({'false', '0', 'no'})
+# Results-table column headings; checklist columns use their chart labels.
+TABLE_HEADER_LABELS = {
+    'status_styled': 'Status',
+    'onboardingDate': 'Onboarding Date',
+    'repName': 'Rep Name',
+    'storeName': 'Store Name',
+    'licenseNumber': 'License No.',
+    'clientSentiment': 'Sentiment',
+    'days_to_confirmation': 'Days to Confirm',
+    'contactName': 'Contact Name',
+    'contactNumber': 'Contact No.',
+    'confirmedNumber': 'Confirmed No.',
+    'deliveryDate': 'Delivery Date',
+    'confirmationTimestamp': 'Confirmation Time',
+    **{req_key: details.get("chart_label", req_key) for req_key, details in KEY_REQUIREMENT_DETAILS.items()},
+}
+# Above this many rows the results table defaults to st.dataframe instead of styled HTML.
+LARGE_TABLE_ROW_THRESHOLD = 500
+# Rows per page of the styled HTML table; only the shown page is rendered and sent.
+TABLE_PAGE_SIZE = 100
+# Most store names offered by the global-search picker at once; a text query narrows the rest.
+STORE_OPTIONS_LIMIT = 50
+
+# Normalized sheet header (lower-case, no whitespace) -> internal column name.
+COLUMN_NAME_MAP = {
+    "licensenumber": "licenseNumber", "dcclicense": "licenseNumber", "dcc": "licenseNumber",
+    "storename": "storeName", "accountname": "storeName",
+    "repname": "repName", "representative": "repName",
+    "onboardingdate": "onboardingDate",
+    "deliverydate": "deliveryDate",
+    "deliverydatets": "deliveryDateTs",
+    "confirmationtimestamp": "confirmationTimestamp", "confirmedat": "confirmationTimestamp",
+    "clientsentiment": "clientSentiment", "sentiment": "clientSentiment",
+    "fulltranscript": "fullTranscript", "transcript": "fullTranscript",
+    "score": "score", "onboardingscore": "score",
+    "status": "status", "onboardingstatus": "status",
+    "summary": "summary", "callsummary": "summary",
+    "contactnumber": "contactNumber", "phone": "contactNumber",
+    "confirmednumber": "confirmedNumber", "verifiednumber": "confirmedNumber",
+    "contactname": "contactName", "clientcontact": "contactName",
+    **{k.lower(): k for k in KEY_REQUIREMENT_DETAILS},
+}
+
+# Precompiled patterns for the vectorized .str passes
+NON_DIGIT_RE = re.compile(r'\D')
+WHITESPACE_RUN_RE = re.compile(r'\s+')
+EPOCH_MS_RE = re.compile(r'^\d{13}$')
+SHEET_DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+STATUS_EMOJI_RE = re.compile(r'✅|⏳|❌')
 
 PST_TIMEZONE = tz.gettz('America/Los_Angeles')
 UTC_TIMEZONE = tz.tzutc()
@@ -175,6 +256,8 @@ plotly_base_layout_settings = dict(
     xaxis_tickfont_color=TEXT_COLOR_FOR_PLOTLY, yaxis_tickfont_color=TEXT_COLOR_FOR_PLOTLY,
     legend_font_color=TEXT_COLOR_FOR_PLOTLY, legend_title_font_color=PRIMARY_COLOR_FOR_PLOTLY
 )
+# Validated once at import; figures start from (or merge) this instead of re-validating the dict each time
+PLOTLY_BASE_LAYOUT = go.Layout(**plotly_base_layout_settings)
 
 # ---------------- Auth / Login ----------------
 def check_login_and_domain():
@@ -202,14 +285,34 @@ def parse_to_utc(series: pd.Series) -> pd.Series:
     if series is None:
         return pd.Series(pd.NaT, dtype="datetime64[ns, UTC]")
 
-    s = series.astype("object")
+    # Sheets repeat the same date text across many rows: parse each distinct value once,
+    # then broadcast back by code (missing values get code -1 and come back as NaT).
+    codes, uniques = pd.factorize(series.astype("object"))
+    if len(uniques) == 0:
+        return pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns, UTC]")
+    parsed = _parse_distinct_to_utc(pd.Series(uniques, dtype="object"))
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=series.index)
 
-    # Start with general parse (strings, ISO, with/without TZ)
-    dt = pd.to_datetime(s, errors="coerce", utc=True)
+def _parse_distinct_to_utc(s: pd.Series) -> pd.Series:
+    """parse_to_utc's parsing passes, run over an object Series of distinct values."""
+    as_str = s.astype(str).str.strip()
+    mask_ms = as_str.str.match(EPOCH_MS_RE, na=False)
+
+    # One exact-format pass first; only the rows it can't read get per-element format inference.
+    # Sheets exports are usually plain 'YYYY-MM-DD HH:MM:SS': sniff a few values and pin that
+    # exact format when they all match. Otherwise let pandas guess a strftime format from the
+    # first value (e.g. '%m/%d/%Y %H:%M'), falling back to ISO 8601 when it can't.
+    sample = as_str[as_str.ne("") & ~mask_ms].head(5)
+    if len(sample) and sample.str.match(SHEET_DATETIME_RE).all():
+        fmt = "%Y-%m-%d %H:%M:%S"
+    else:
+        fmt = (guess_datetime_format(sample.iloc[0]) if len(sample) else None) or "ISO8601"
+    dt = pd.to_datetime(s, errors="coerce", utc=True, format=fmt)
+    residual = dt.isna() & s.notna() & as_str.ne("") & ~mask_ms
+    if residual.any():
+        dt.loc[residual] = pd.to_datetime(s[residual], errors="coerce", utc=True, format="mixed")
 
     # Fix any 13-digit epoch ms that may have been parsed as NaT or strings
-    as_str = s.astype(str).str.strip()
-    mask_ms = as_str.str.match(r"^\d{13}$", na=False)
     if mask_ms.any():
         ms_vals = as_str[mask_ms].astype(np.int64)
         dt.loc[mask_ms] = pd.to_datetime(ms_vals, unit="ms", utc=True, errors="coerce")
@@ -224,20 +327,48 @@ def parse_to_utc(series: pd.Series) -> pd.Series:
     return dt
 
 def pst_display_from_utc(utc_series: pd.Series) -> pd.Series:
-    """Format tz-aware UTC datetimes as PST strings for display."""
+    """Format UTC datetimes as PST strings for display (NaT stays missing)."""
     if utc_series is None or utc_series.empty:
         return utc_series
-    if not hasattr(utc_series, "dt"):
-        return utc_series
-    try:
-        pst = utc_series.dt.tz_convert(PST_TIMEZONE)
-        return pst.dt.strftime('%Y-%m-%d %I:%M %p PST')
-    except Exception:
-        return utc_series.astype(str)
+    # One coercion normalizes naive / aware / object input, so no per-element fallback is needed
+    pst = pd.to_datetime(utc_series, utc=True, errors="coerce").dt.tz_convert(PST_TIMEZONE)
+    return pst.dt.strftime('%Y-%m-%d %I:%M %p PST')
+
+# ---------------- Formatting Helpers ----------------
+def format_phone_series(series: pd.Series) -> pd.Series:
+    """Format 10-digit and 1-prefixed 11-digit numbers as US phone strings; others pass through."""
+    text = series.astype("string").fillna("")
+    digits = text.str.replace(NON_DIGIT_RE, "", regex=True)
+    n_digits = digits.str.len()
+    len10 = n_digits.eq(10)
+    len11 = n_digits.eq(11) & digits.str.startswith("1")
+    out = text.where(text.str.strip().ne(""), "")
+    d = digits[len10]
+    out[len10] = "(" + d.str[0:3] + ") " + d.str[3:6] + "-" + d.str[6:10]
+    d = digits[len11]
+    out[len11] = "+1 (" + d.str[1:4] + ") " + d.str[4:7] + "-" + d.str[7:11]
+    return out
+
+def confirmed_mask(status):
+    """Boolean ndarray marking rows whose status mentions 'confirmed'.
+
+    For categoricals the string test runs once per category and is broadcast
+    through the integer codes instead of lower-casing every row.
+    """
+    if isinstance(status.dtype, pd.CategoricalDtype):
+        hits = np.asarray(status.cat.categories.str.lower().str.contains('confirmed'), dtype=bool)
+        # Trailing False catches code -1 (missing)
+        return np.append(hits, False)[status.cat.codes.to_numpy()]
+    return status.str.lower().str.contains('confirmed', na=False).to_numpy(dtype=bool)
 
 # ---------------- Google Auth (gspread) ----------------
-@st.cache_data(ttl=600)
+# Live client / worksheet objects hold HTTP sessions: shared as resources, never pickled.
+@st.cache_resource(ttl=3600)
 def authenticate_gspread_cached():
+    # gspread / google-auth are imported on first use: a worker serving cached or
+    # snapshotted data never needs them.
+    import gspread
+    from google.oauth2.service_account import Credentials
     gcp_secrets_obj = st.secrets.get("gcp_service_account")
     if gcp_secrets_obj is None:
         st.error("🚨 Error: GCP secrets (gcp_service_account) NOT FOUND.")
@@ -255,14 +386,276 @@ def authenticate_gspread_cached():
         st.error(f"🚨 Error authenticating with Google: {e}")
         return None
 
-# ---------------- Load & Clean Data ----------------
-@st.cache_data(ttl=600, show_spinner="🔄 Fetching latest onboarding data...")
-def load_data_from_google_sheet():
+@st.cache_resource(ttl=600)
+def open_worksheet(sheet_url_or_name, worksheet_name):
+    """Worksheet handle, so refetches skip re-opening the spreadsheet metadata."""
     gc = authenticate_gspread_cached()
+    ss = gc.open_by_url(sheet_url_or_name) if ("docs.google.com" in sheet_url_or_name or "spreadsheets" in sheet_url_or_name) else gc.open(sheet_url_or_name)
+    return ss.worksheet(worksheet_name)
+
+# ---------------- Load & Clean Data ----------------
+# Sheet contents are cached per revision: the spreadsheet's Drive modifiedTime, re-checked every
+# SHEET_REVISION_TTL_SECONDS. An unchanged sheet is never refetched; when the revision can't be
+# read, the key falls back to a SHEET_FETCH_TTL_SECONDS time bucket (the old fixed-TTL behaviour).
+SHEET_FETCH_TTL_SECONDS = 600
+SHEET_REVISION_TTL_SECONDS = 60
+
+@st.cache_data(ttl=SHEET_REVISION_TTL_SECONDS, show_spinner=False)
+def sheet_revision(sheet_url_or_name, worksheet_name):
+    """Cache key for the sheet's current contents (a Drive modifiedTime, or a time bucket)."""
+    fallback = f"ttl-{int(time.time() // SHEET_FETCH_TTL_SECONDS)}"
+    if authenticate_gspread_cached() is None:
+        return fallback
+    import gspread
+    import requests
+    try:
+        # get_lastUpdateTime() asks Drive every time; the lastUpdateTime property is only read
+        # when the (cached) Spreadsheet handle is created, so it would go stale.
+        return str(open_worksheet(sheet_url_or_name, worksheet_name).spreadsheet.get_lastUpdateTime())
+    except gspread.exceptions.APIError as e:
+        # Usually a missing Drive scope or permission: worth surfacing, not just bucketing
+        logger.warning("Sheet revision check failed (%s); using time-bucketed refetches.", e)
+        return fallback
+    except (gspread.exceptions.GSpreadException, requests.exceptions.RequestException, KeyError) as e:
+        logger.info("Sheet revision unavailable (%s); using time-bucketed refetches.", e)
+        return fallback
+
+# Last fetched sheet values on local disk, tagged with their revision, so a cold start (fresh
+# process, empty in-memory cache) on an unchanged sheet skips the Google Sheets round-trip.
+# Best-effort: any I/O error just means the sheet is fetched as usual.
+# The rows include call transcripts and licence / phone numbers, so the snapshot lives in a
+# private (0700) directory next to Streamlit's own persist cache, never in the shared temp dir.
+SHEET_SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".streamlit", "cache", "onboarding_snapshots")
+
+def sheet_snapshot_dir():
+    """The private snapshot directory, created 0700 if needed; None if it isn't ours alone."""
+    try:
+        os.makedirs(SHEET_SNAPSHOT_DIR, mode=0o700, exist_ok=True)
+        st_dir = os.stat(SHEET_SNAPSHOT_DIR)
+        if st_dir.st_uid != os.getuid():
+            return None
+        if st_dir.st_mode & 0o077:
+            os.chmod(SHEET_SNAPSHOT_DIR, 0o700)
+        return SHEET_SNAPSHOT_DIR
+    except OSError:
+        return None
+
+def sheet_snapshot_paths(sheet_url_or_name, worksheet_name):
+    """(parquet, manifest) paths of the local snapshot for one worksheet, or None."""
+    snapshot_dir = sheet_snapshot_dir()
+    if snapshot_dir is None:
+        return None
+    key = hashlib.sha1(f"{sheet_url_or_name}\x00{worksheet_name}".encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(snapshot_dir, f"onboarding_sheet_{key}")
+    return f"{base}.parquet", f"{base}.json"
+
+def replace_file_atomically(path, write):
+    """Call write(tmp_path) on a fresh 0600 file in path's directory, then move it over path."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def read_sheet_snapshot(sheet_url_or_name, worksheet_name, revision):
+    """(rows, digest, fetched_at) from a snapshot taken at this revision, else None."""
+    paths = sheet_snapshot_paths(sheet_url_or_name, worksheet_name)
+    if paths is None:
+        return None
+    data_path, manifest_path = paths
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["revision"] != revision:
+            return None
+        fetched_at = datetime.fromisoformat(manifest["fetched_at"])
+        rows = pd.read_parquet(data_path).to_numpy(dtype=object).tolist()
+        if len(rows) != manifest["rows"]:
+            return None
+        # Data and manifest are replaced one after the other; make sure they belong together
+        if hashlib.sha1(repr(rows).encode("utf-8")).hexdigest() != manifest["digest"]:
+            return None
+        return rows, manifest["digest"], fetched_at
+    except (OSError, ValueError, KeyError):
+        return None
+
+def write_sheet_snapshot(sheet_url_or_name, worksheet_name, revision, rows, digest, fetched_at):
+    paths = sheet_snapshot_paths(sheet_url_or_name, worksheet_name)
+    if paths is None:
+        return
+    data_path, manifest_path = paths
+    manifest = {"revision": revision, "fetched_at": fetched_at.isoformat(), "digest": digest, "rows": len(rows)}
+
+    def write_manifest(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    try:
+        replace_file_atomically(data_path, lambda tmp_path: pd.DataFrame(rows, dtype="string").rename(columns=str).to_parquet(tmp_path, index=False))
+        replace_file_atomically(manifest_path, write_manifest)
+    except (OSError, ValueError):
+        pass
+
+def clear_sheet_snapshot():
+    """Drop the local snapshot so the next fetch goes to Google Sheets (used by Refresh)."""
+    paths = sheet_snapshot_paths(st.secrets.get("GOOGLE_SHEET_URL_OR_NAME"), st.secrets.get("GOOGLE_WORKSHEET_NAME"))
+    for path in paths or ():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+@st.cache_data(max_entries=4, show_spinner="🔄 Fetching latest onboarding data...")
+def fetch_sheet_records(sheet_url_or_name, worksheet_name, revision):
+    """Raw worksheet values (header row first), a content digest of them, and the fetch time (UTC).
+
+    Cached per sheet and revision. Returns (None, None, None) when the sheet could not be read.
+    """
     now_utc = datetime.now(tz=UTC_TIMEZONE)
-    if gc is None:
-        return pd.DataFrame(), None
+    if authenticate_gspread_cached() is None:
+        return None, None, None
+
+    snapshot = read_sheet_snapshot(sheet_url_or_name, worksheet_name, revision)
+    if snapshot is not None:
+        return snapshot
+
+    import gspread
+    try:
+        rows = open_worksheet(sheet_url_or_name, worksheet_name).get_all_values()
+    except (gspread.exceptions.SpreadsheetNotFound, gspread.exceptions.WorksheetNotFound) as e:
+        st.error(f"🚫 Google Sheets Error: {e}. Check URL/name & permissions.")
+        return None, None, None
+    except Exception as e:
+        st.error(f"🌪️ Error loading data: {e}")
+        return None, None, None
+
+    digest = hashlib.sha1(repr(rows).encode("utf-8")).hexdigest()
+    write_sheet_snapshot(sheet_url_or_name, worksheet_name, revision, rows, digest, now_utc)
+    return rows, digest, now_utc
+
+@st.cache_data(persist="disk", max_entries=4, show_spinner="🧹 Preparing onboarding data...")
+def normalize_sheet_records(digest, _rows):
+    """Build the cleaned dashboard frame from the raw sheet values.
+
+    Keyed on the content digest only (_rows is not hashed) and persisted to disk,
+    so an unchanged sheet skips the parsing / formatting pipeline even after a restart.
+    """
+    # --- Normalize column names while building the frame from the 2-D value grid ---
+    headers = ["".join(str(h).strip().lower().split()) for h in _rows[0]]
+    df = pd.DataFrame(_rows[1:], columns=headers)
+
+    # --- Map to internal names ---
+    df.rename(columns={k: v for k, v in COLUMN_NAME_MAP.items() if k in df.columns and v not in df.columns}, inplace=True)
+
+    # --- Build UTC datetime columns (tz-aware!) ---
+    # Prefer deliveryDateTs if present and deliveryDate missing/blank
+    if "deliveryDate" not in df.columns and "deliveryDateTs" in df.columns:
+        df["deliveryDate"] = df["deliveryDateTs"]
+
+    # Raw, pre-parse strings
+    for col in ["onboardingDate", "deliveryDate", "confirmationTimestamp"]:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.replace("\n", " ", regex=False).str.strip()
+
+    # Parse to tz-aware UTC
+    # (absent columns become all-NaT but still tz-aware, so .dt / subtraction below stay valid)
+    for col in ["onboardingDate", "deliveryDate", "confirmationTimestamp"]:
+        df[f"{col}_dt"] = (parse_to_utc(df[col]) if col in df.columns
+                           else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns, UTC]"))
+
+    # Display strings in PST
+    if "onboardingDate_dt" in df.columns:
+        df["onboardingDate"] = pst_display_from_utc(df["onboardingDate_dt"])
+    if "deliveryDate_dt" in df.columns:
+        df["deliveryDate"] = pst_display_from_utc(df["deliveryDate_dt"])
+    if "confirmationTimestamp_dt" in df.columns:
+        df["confirmationTimestamp"] = pst_display_from_utc(df["confirmationTimestamp_dt"])
+
+    # Date-only for filters (from tz-aware UTC → PST day), kept as naive datetime64 midnights
+    # so date masks, MTD buckets and trend bins all compare in C instead of on date objects
+    if "onboardingDate_dt" in df.columns:
+        onboarding_pst = df["onboardingDate_dt"].dt.tz_convert(PST_TIMEZONE)
+        df["onboarding_date_only"] = onboarding_pst.dt.tz_localize(None).dt.normalize()
+    else:
+        df["onboarding_date_only"] = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    # Data date bounds, kept on the frame so date-range defaults never rescan the column.
+    # Stored as ISO strings: attrs follow every slice of the frame and must stay JSON-safe.
+    onboarding_days = df["onboarding_date_only"].dropna()
+    df.attrs["onboarding_min"] = onboarding_days.min().date().isoformat() if not onboarding_days.empty else None
+    df.attrs["onboarding_max"] = onboarding_days.max().date().isoformat() if not onboarding_days.empty else None
+    df.attrs["has_dates"] = not onboarding_days.empty
+
+    # --- days_to_confirmation on raw UTC nanoseconds (NaT is the int64 minimum) ---
+    delivery_ns = df["deliveryDate_dt"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    confirm_ns = df["confirmationTimestamp_dt"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    nat_ns = np.iinfo(np.int64).min
+    both = (delivery_ns != nat_ns) & (confirm_ns != nat_ns)
+    days = np.full(len(df), np.nan)
+    days[both] = np.round((confirm_ns[both] - delivery_ns[both]) / 86_400e9)
+    # Whole days fit exactly in float32; half the footprint of float64, NaN still marks "unknown"
+    df["days_to_confirmation"] = days.astype(np.float32)
+
+    # --- Clean & format other fields ---
+    for phone_col in ["contactNumber", "confirmedNumber"]:
+        if phone_col in df.columns:
+            df[phone_col] = format_phone_series(df[phone_col])
+    for name_col in ["repName", "contactName"]:
+        if name_col in df.columns:
+            names = df[name_col].astype("string").fillna("")
+            df[name_col] = names.str.replace(WHITESPACE_RUN_RE, " ", regex=True).str.strip().str.title()
+
+    string_cols = [
+        'status', 'clientSentiment', 'repName', 'storeName', 'licenseNumber', 'fullTranscript',
+        'summary', 'contactName', 'contactNumber', 'confirmedNumber',
+        'onboardingDate', 'deliveryDate', 'confirmationTimestamp'
+    ]
+    for col in string_cols:
+        if col not in df.columns:
+            df[col] = ""
+    # One block conversion to Arrow-backed strings (vectorized .str kernels, roughly half the
+    # memory of object dtype), then blank out missing values and their stringified spellings.
+    df[string_cols] = (
+        df[string_cols].astype("string[pyarrow]")
+        .replace(['nan', 'NaN', 'None', 'NaT', '<NA>'], "", regex=False)
+        .fillna("")
+    )
+    # Lower-cased once here so the license search is a plain substring scan, no per-rerun casefold
+    df["licenseNumber_lc"] = df["licenseNumber"].str.lower()
+    # Low-cardinality columns as categoricals so value_counts / isin / status checks run on codes
+    # (stripped first, so stray padding in the sheet doesn't split one value into two categories)
+    for col in ['status', 'clientSentiment', 'repName', 'storeName']:
+        df[col] = df[col].str.strip().astype('category')
+
+    # Scores are 0-10 with one decimal shown: float32 holds them at half the footprint
+    score = pd.to_numeric(df["score"], errors="coerce") if "score" in df.columns else np.nan
+    df["score"] = pd.Series(score, index=df.index).astype(np.float32)
+    # Confirmed flag computed once per load; metrics and charts sum / mask on it directly
+    df["is_confirmed"] = confirmed_mask(df["status"])
+
+    missing_req = [c for c in ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS if c not in df.columns]
+    if missing_req:
+        df = df.reindex(columns=[*df.columns, *missing_req])
+
+    # Encode the checklist once so charts reduce a compact 2-D uint8 matrix instead of re-parsing strings
+    req_raw = df[ORDERED_CHART_REQUIREMENTS]
+    req_met = req_raw.astype(str).apply(lambda s: s.str.strip().str.lower()).isin(REQUIREMENT_MET_VALUES)
+    req_flags = np.where(req_raw.notna().to_numpy(), req_met.to_numpy(), REQUIREMENT_FLAG_BLANK).astype(np.uint8)
+    df[REQUIREMENT_FLAG_COLS] = pd.DataFrame(req_flags, index=df.index, columns=REQUIREMENT_FLAG_COLS)
+
+    # Drop legacy columns if present
+    # (deliverydatets is renamed to deliveryDateTs by COLUMN_NAME_MAP, so drop that spelling too)
+    df.drop(columns=["deliverydatets", "deliveryDateTs", "onboardingwelcome"], errors="ignore", inplace=True)
+
+    return df
 
+def load_data_from_google_sheet():
+    # Validate the data-source secrets before anything talks to gspread
     sheet_url_or_name = st.secrets.get("GOOGLE_SHEET_URL_OR_NAME")
     worksheet_name = st.secrets.get("GOOGLE_WORKSHEET_NAME")
     if not sheet_url_or_name:
@@ -272,150 +665,79 @@ def load_data_from_google_sheet():
         st.error("🚨 Config: GOOGLE_WORKSHEET_NAME missing.")
         return pd.DataFrame(), None
 
-    try:
-        ss = gc.open_by_url(sheet_url_or_name) if ("docs.google.com" in sheet_url_or_name or "spreadsheets" in sheet_url_or_name) else gc.open(sheet_url_or_name)
-        ws = ss.worksheet(worksheet_name)
-        rows = ws.get_all_records(head=1, expected_headers=None)
-        if not rows:
-            st.warning("⚠️ No data rows in Google Sheet.")
-            return pd.DataFrame(), now_utc
-
-        df = pd.DataFrame(rows)
-
-        # --- Normalize column names ---
-        df.rename(columns={c: "".join(str(c).strip().lower().split()) for c in df.columns}, inplace=True)
-
-        # --- Map to internal names ---
-        name_map = {
-            "licensenumber": "licenseNumber", "dcclicense": "licenseNumber", "dcc": "licenseNumber",
-            "storename": "storeName", "accountname": "storeName",
-            "repname": "repName", "representative": "repName",
-            "onboardingdate": "onboardingDate",
-            "deliverydate": "deliveryDate",
-            "deliverydatets": "deliveryDateTs",
-            "confirmationtimestamp": "confirmationTimestamp", "confirmedat": "confirmationTimestamp",
-            "clientsentiment": "clientSentiment", "sentiment": "clientSentiment",
-            "fulltranscript": "fullTranscript", "transcript": "fullTranscript",
-            "score": "score", "onboardingscore": "score",
-            "status": "status", "onboardingstatus": "status",
-            "summary": "summary", "callsummary": "summary",
-            "contactnumber": "contactNumber", "phone": "contactNumber",
-            "confirmednumber": "confirmedNumber", "verifiednumber": "confirmedNumber",
-            "contactname": "contactName", "clientcontact": "contactName",
-        }
-        for k in KEY_REQUIREMENT_DETAILS.keys():
-            name_map[k.lower()] = k
-
-        df.rename(columns={k: v for k, v in name_map.items() if k in df.columns and v not in df.columns}, inplace=True)
-
-        # --- Build UTC datetime columns (tz-aware!) ---
-        # Prefer deliveryDateTs if present and deliveryDate missing/blank
-        if "deliveryDate" not in df.columns and "deliveryDateTs" in df.columns:
-            df["deliveryDate"] = df["deliveryDateTs"]
-
-        # Raw, pre-parse strings
-        for col in ["onboardingDate", "deliveryDate", "confirmationTimestamp"]:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace("\n", " ", regex=False).str.strip()
-
-        # Parse to tz-aware UTC
-        df["onboardingDate_dt"] = parse_to_utc(df["onboardingDate"]) if "onboardingDate" in df.columns else pd.NaT
-        df["deliveryDate_dt"] = parse_to_utc(df["deliveryDate"]) if "deliveryDate" in df.columns else pd.NaT
-        df["confirmationTimestamp_dt"] = parse_to_utc(df["confirmationTimestamp"]) if "confirmationTimestamp" in df.columns else pd.NaT
-
-        # Display strings in PST
-        if "onboardingDate_dt" in df.columns:
-            df["onboardingDate"] = pst_display_from_utc(df["onboardingDate_dt"])
-        if "deliveryDate_dt" in df.columns:
-            df["deliveryDate"] = pst_display_from_utc(df["deliveryDate_dt"])
-        if "confirmationTimestamp_dt" in df.columns:
-            df["confirmationTimestamp"] = pst_display_from_utc(df["confirmationTimestamp_dt"])
-
-        # Date-only for filters (from tz-aware UTC → PST date)
-        if "onboardingDate_dt" in df.columns:
-            df["onboarding_date_only"] = df["onboardingDate_dt"].dt.tz_convert(PST_TIMEZONE).dt.date
-        else:
-            df["onboarding_date_only"] = pd.NaT
-
-        # --- SAFE tz-aware subtraction for days_to_confirmation ---
-        try:
-            delivery_utc = df["deliveryDate_dt"]
-            confirm_utc = df["confirmationTimestamp_dt"]
-            diff = confirm_utc - delivery_utc
-            df["days_to_confirmation"] = (diff.dt.total_seconds() / 86400.0).round(0)
-        except Exception as e:
-            st.warning(f"Days-to-confirmation calculation fallback: {e}")
-            df["days_to_confirmation"] = np.nan
-
-        # --- Clean & format other fields ---
-        for phone_col in ["contactNumber", "confirmedNumber"]:
-            if phone_col in df.columns:
-                df[phone_col] = df[phone_col].apply(lambda x: "" if pd.isna(x) or not str(x).strip() else (
-                    (lambda d: f"({d[0:3]}) {d[3:6]}-{d[6:10]}" if len(d) == 10 else
-                     (f"+1 ({d[1:4]}) {d[4:7]}-{d[7:11]}" if len(d) == 11 and d.startswith('1') else str(x))
-                    )(re.sub(r'\D', '', str(x)))
-                ))
-        for name_col in ["repName", "contactName"]:
-            if name_col in df.columns:
-                df[name_col] = df[name_col].apply(lambda s: "" if pd.isna(s) or not str(s).strip() else ' '.join(w.capitalize() for w in str(s).split()))
-
-        string_cols = [
-            'status', 'clientSentiment', 'repName', 'storeName', 'licenseNumber', 'fullTranscript',
-            'summary', 'contactName', 'contactNumber', 'confirmedNumber',
-            'onboardingDate', 'deliveryDate', 'confirmationTimestamp'
-        ]
-        for col in string_cols:
-            df[col] = df.get(col, "").astype(str).replace(['nan', 'NaN', 'None', 'NaT', '<NA>'], "", regex=False).fillna("")
-
-        df["score"] = pd.to_numeric(df.get("score"), errors="coerce")
-
-        for col in ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS:
-            df[col] = df.get(col, pd.NA)
-
-        # Drop legacy columns if present
-        for c in ["deliverydatets", "onboardingwelcome"]:
-            if c in df.columns:
-                df.drop(columns=[c], inplace=True)
-
-        return df, now_utc
-
-    except (gspread.exceptions.SpreadsheetNotFound, gspread.exceptions.WorksheetNotFound) as e:
-        st.error(f"🚫 Google Sheets Error: {e}. Check URL/name & permissions.")
+    revision = sheet_revision(sheet_url_or_name, worksheet_name)
+    rows, digest, now_utc = fetch_sheet_records(sheet_url_or_name, worksheet_name, revision)
+    if now_utc is None:
+        # Don't pin a failed fetch to an unchanged revision; retry on the next run
+        fetch_sheet_records.clear()
         return pd.DataFrame(), None
+    if len(rows) < 2:
+        st.warning("⚠️ No data rows in Google Sheet.")
+        return pd.DataFrame(), now_utc
+    try:
+        return normalize_sheet_records(digest, rows), now_utc
     except Exception as e:
         st.error(f"🌪️ Error loading data: {e}")
         return pd.DataFrame(), None
 
-@st.cache_data
-def convert_df_to_csv(df_to_convert):
-    return df_to_convert.to_csv(index=False).encode('utf-8')
+# The serializers (dashboard_helpers) are plain functions: callers cache the bytes per filter
+# state (build_results_csv / _parquet), so hashing the export frame there would only add an O(N) pass.
+def results_export_frame(columns, df):
+    export = df.reindex(columns=list(columns))
+    if 'status_styled' in export.columns:
+        export['status_styled'] = styled_status(df)
+    return export
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_results_csv(filter_sig, context_key_prefix, columns, _df):
+    # Keyed on the filter state, not the frame, so reruns that keep the same
+    # filters (record picks, tab switches) skip hashing and re-serializing.
+    return convert_df_to_csv(results_export_frame(columns, _df))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_results_parquet(filter_sig, context_key_prefix, columns, _df):
+    # Columnar, compressed and typed: much cheaper to encode than CSV for large result sets.
+    return convert_df_to_parquet(results_export_frame(columns, _df))
+
+def metric_arrays(df_input):
+    """(confirmed, score, days) as plain NumPy arrays; numeric / boolean since load."""
+    return (df_input['is_confirmed'].to_numpy(dtype=bool),
+            df_input['score'].to_numpy(dtype=np.float64, na_value=np.nan),
+            df_input['days_to_confirmation'].to_numpy(dtype=np.float64, na_value=np.nan))
+
+def metrics_from_arrays(confirmed, score, days):
+    if confirmed.shape[0] == 0:
+        return 0, 0.0, pd.NA, pd.NA
+    total, success_rate, avg_score, avg_days = metrics_kernel(confirmed, score, days)
+    return int(total), float(success_rate), float(avg_score), float(avg_days)
 
 def calculate_metrics(df_input):
     if df_input.empty:
         return 0, 0.0, pd.NA, pd.NA
-    total = len(df_input)
-    confirmed = df_input[df_input['status'].astype(str).str.lower().str.contains('confirmed', na=False)].shape[0]
-    success_rate = (confirmed / total * 100) if total > 0 else 0.0
-    avg_score = pd.to_numeric(df_input['score'], errors='coerce').mean()
-    avg_days = pd.to_numeric(df_input['days_to_confirmation'], errors='coerce').mean()
-    return total, success_rate, avg_score, avg_days
-
-def get_default_date_range(date_series):
+    return metrics_from_arrays(*metric_arrays(df_input))
+
+def onboarding_date_bounds(df):
+    """(min, max) onboarding date of a loaded frame, from the bounds the loader stored in attrs."""
+    return tuple(date.fromisoformat(d) if d else None
+                 for d in (df.attrs.get('onboarding_min'), df.attrs.get('onboarding_max')))
+
+def get_default_date_range(min_date=None, max_date=None):
     today = date.today()
     start_of_month = today.replace(day=1)
-    if date_series is not None:
-        ser = pd.to_datetime(date_series, errors='coerce').dropna()
-        if not ser.empty:
-            min_date = ser.dt.date.min()
-            max_date = ser.dt.date.max()
-        else:
-            min_date = max_date = None
-    else:
-        min_date = max_date = None
     start = max(start_of_month, min_date) if min_date else start_of_month
     end = min(today, max_date) if max_date else today
     return (start, end) if start <= end else ((min_date, max_date) if min_date and max_date else (start_of_month, today))
 
+def clamp_to_data_bounds(start, end):
+    """(start, end) clamped to the loaded data's date bounds, as the date widget accepts it."""
+    min_d = st.session_state.get('min_data_date_for_filter')
+    max_d = st.session_state.get('max_data_date_for_filter')
+    if min_d and start < min_d:
+        start = min_d
+    if max_d and end > max_d:
+        end = max_d
+    return (min(start, end), end)
+
 # ---------------- Auth Gate ----------------
 auth_status = check_login_and_domain()
 if auth_status != 'AUTHORIZED':
@@ -435,10 +757,11 @@ if auth_status != 'AUTHORIZED':
     st.stop()
 
 # ---------------- Session State ----------------
-default_s_init, default_e_init = get_default_date_range(None)
+default_s_init, default_e_init = get_default_date_range()
 if 'data_loaded' not in st.session_state: st.session_state.data_loaded = False
 if 'df_original' not in st.session_state: st.session_state.df_original = pd.DataFrame()
 if 'last_data_refresh_time' not in st.session_state: st.session_state.last_data_refresh_time = None
+if 'data_version' not in st.session_state: st.session_state.data_version = None
 if 'date_range' not in st.session_state: st.session_state.date_range = (default_s_init, default_e_init)
 if 'min_data_date_for_filter' not in st.session_state: st.session_state.min_data_date_for_filter = None
 if 'max_data_date_for_filter' not in st.session_state: st.session_state.max_data_date_for_filter = None
@@ -449,7 +772,6 @@ for s_key in ['licenseNumber_search', 'storeName_search']:
     st.session_state.setdefault(s_key, "")
 TAB_OVERVIEW = "📊 Overview"; TAB_DETAILED_ANALYSIS = "🔎 Detailed Analysis"; TAB_TRENDS = "📈 Trends & Distributions"
 ALL_TABS = [TAB_OVERVIEW, TAB_DETAILED_ANALYSIS, TAB_TRENDS]
-st.session_state.setdefault('active_tab', TAB_OVERVIEW)
 st.session_state.setdefault('selected_transcript_key_dialog_global_search', None)
 st.session_state.setdefault('selected_transcript_key_filtered_analysis', None)
 st.session_state.setdefault('show_global_search_dialog', False)
@@ -459,19 +781,18 @@ if not st.session_state.data_loaded:
     df_loaded, load_time = load_data_from_google_sheet()
     if load_time:
         st.session_state.last_data_refresh_time = load_time
+        # Cheap cache key for everything derived from df_original. Taken from the load
+        # timestamp (not a per-session counter) because st.cache_data is shared across
+        # sessions, and every session reading the same cached load gets the same version.
+        st.session_state.data_version = int(load_time.timestamp() * 1_000_000)
         if not df_loaded.empty:
             st.session_state.df_original = df_loaded
             st.session_state.data_loaded = True
-            if 'onboarding_date_only' in df_loaded:
-                series = pd.to_datetime(df_loaded['onboarding_date_only'], errors='coerce')
-                valid = series.dropna()
-                min_d = valid.dt.date.min() if not valid.empty else None
-                max_d = valid.dt.date.max() if not valid.empty else None
-            else:
-                min_d = max_d = None
+            min_d, max_d = onboarding_date_bounds(df_loaded)
             st.session_state.min_data_date_for_filter = min_d
             st.session_state.max_data_date_for_filter = max_d
-            st.session_state.date_range = get_default_date_range(df_loaded.get('onboarding_date_only'))
+            st.session_state.date_range = get_default_date_range(min_d, max_d)
+            st.session_state.date_selector_custom = st.session_state.date_range
         else:
             st.session_state.df_original = pd.DataFrame()
             st.session_state.data_loaded = False
@@ -488,36 +809,64 @@ st.sidebar.subheader("🔍 Global Search")
 st.sidebar.caption("Search all data. Overrides filters below.")
 global_search_cols = {"licenseNumber": "License Number", "storeName": "Store Name"}
 
-ln_search_val = st.sidebar.text_input(
-    f"Search {global_search_cols['licenseNumber']}:",
-    value=st.session_state.get("licenseNumber_search", ""),
-    key="licenseNumber_global_search_widget",
-    help="Enter license number part."
-)
-if ln_search_val != st.session_state["licenseNumber_search"]:
-    st.session_state["licenseNumber_search"] = ln_search_val
-    st.session_state.show_global_search_dialog = bool(ln_search_val or st.session_state.get("storeName_search", ""))
-    st.rerun()
+@st.cache_data(show_spinner=False)
+def store_search_options(data_version, _stores):
+    """Blank entry plus the sorted, non-blank store names. _stores is not hashed; data_version keys it."""
+    # Categories are already the sorted distinct store names; no per-row scan needed
+    return [""] + [x for x in _stores.cat.categories if str(x).strip()]
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def matching_store_options(data_version, query, _all_options):
+    """Blank entry plus up to STORE_OPTIONS_LIMIT store names containing query (case-insensitive)."""
+    names = _all_options[1:]
+    if query:
+        names = [n for n in names if query in n.lower()]
+    return [""] + names[:STORE_OPTIONS_LIMIT]
+
+@st.fragment
+def global_search_controls(store_names_options):
+    """Search widgets as a fragment: interacting with them reruns only this block, and the
+    full app reruns only when a search term actually changes."""
+    ln_search_val = st.text_input(
+        f"Search {global_search_cols['licenseNumber']}:",
+        value=st.session_state.get("licenseNumber_search", ""),
+        key="licenseNumber_global_search_widget",
+        help="Enter license number part."
+    )
+    if ln_search_val != st.session_state["licenseNumber_search"]:
+        st.session_state["licenseNumber_search"] = ln_search_val
+        st.session_state.show_global_search_dialog = bool(ln_search_val or st.session_state.get("storeName_search", ""))
+        st.rerun()
+
+    current_store_search_val = st.session_state.get("storeName_search", "")
+    store_query = st.text_input(
+        "Find store:", key="store_query_widget", placeholder="Type part of a store name",
+        help=f"Narrows the store list below (first {STORE_OPTIONS_LIMIT} matches shown)."
+    )
+    store_names_options = matching_store_options(st.session_state.data_version, store_query.strip().lower(), store_names_options)
+    if current_store_search_val and current_store_search_val not in store_names_options:
+        # Keep the active selection pickable so narrowing the list never clears the search
+        store_names_options = ["", current_store_search_val] + store_names_options[1:]
+    try:
+        current_store_idx = store_names_options.index(current_store_search_val) if current_store_search_val in store_names_options else 0
+    except ValueError:
+        current_store_idx = 0
+    selected_store_val = st.selectbox(
+        f"Search {global_search_cols['storeName']}:",
+        options=store_names_options, index=current_store_idx,
+        key="storeName_global_search_widget",
+        help="Select or type store name."
+    )
+    if selected_store_val != st.session_state["storeName_search"]:
+        st.session_state["storeName_search"] = selected_store_val
+        st.session_state.show_global_search_dialog = bool(selected_store_val or st.session_state.get("licenseNumber_search", ""))
+        st.rerun()
 
 store_names_options = [""]
 if not df_original.empty and 'storeName' in df_original.columns:
-    unique_stores = sorted(df_original['storeName'].astype(str).dropna().unique())
-    store_names_options.extend([x for x in unique_stores if str(x).strip()])
-current_store_search_val = st.session_state.get("storeName_search", "")
-try:
-    current_store_idx = store_names_options.index(current_store_search_val) if current_store_search_val in store_names_options else 0
-except ValueError:
-    current_store_idx = 0
-selected_store_val = st.sidebar.selectbox(
-    f"Search {global_search_cols['storeName']}:",
-    options=store_names_options, index=current_store_idx,
-    key="storeName_global_search_widget",
-    help="Select or type store name."
-)
-if selected_store_val != st.session_state["storeName_search"]:
-    st.session_state["storeName_search"] = selected_store_val
-    st.session_state.show_global_search_dialog = bool(selected_store_val or st.session_state.get("licenseNumber_search", ""))
-    st.rerun()
+    store_names_options = store_search_options(st.session_state.data_version, df_original['storeName'])
+with st.sidebar:
+    global_search_controls(store_names_options)
 
 st.sidebar.markdown("---")
 global_search_active = bool(st.session_state.get("licenseNumber_search", "") or st.session_state.get("storeName_search", ""))
@@ -525,95 +874,114 @@ global_search_active = bool(st.session_state.get("licenseNumber_search", "") or
 st.sidebar.subheader("📊 Filters")
 st.sidebar.caption("Filters overridden by Global Search." if global_search_active else "Apply filters to dashboard data.")
 st.sidebar.markdown("##### Quick Date Ranges")
+
+# Filter widgets write through on_click / on_change callbacks. Callbacks run before the
+# widget-triggered rerun, so that single rerun already sees the new state; an explicit
+# st.rerun() here would execute the whole script a second time.
+def apply_date_range(start, end):
+    if start and end:
+        st.session_state.date_range = (start, end)
+        st.session_state.date_filter_is_active = True
+        # The keyed date_input ignores value= after its first run, so write its state too
+        st.session_state.date_selector_custom = clamp_to_data_bounds(start, end)
+
+def on_custom_date_change():
+    selected = st.session_state.date_selector_custom
+    if isinstance(selected, tuple) and len(selected) == 2:
+        apply_date_range(*selected)
+
 s1, s2, s3 = st.sidebar.columns(3)
 today_for_shortcuts = date.today()
-if s1.button("MTD", use_container_width=True, disabled=global_search_active, type="primary"):
-    if not global_search_active:
-        st.session_state.date_range = (today_for_shortcuts.replace(day=1), today_for_shortcuts)
-        st.session_state.date_filter_is_active = True
-        st.rerun()
-if s2.button("YTD", use_container_width=True, disabled=global_search_active, type="primary"):
-    if not global_search_active:
-        st.session_state.date_range = (today_for_shortcuts.replace(month=1, day=1), today_for_shortcuts)
-        st.session_state.date_filter_is_active = True
-        st.rerun()
-if s3.button("ALL", use_container_width=True, disabled=global_search_active, type="primary"):
-    if not global_search_active:
-        all_start = st.session_state.get('min_data_date_for_filter', today_for_shortcuts.replace(year=today_for_shortcuts.year-1))
-        all_end = st.session_state.get('max_data_date_for_filter', today_for_shortcuts)
-        if all_start and all_end:
-            st.session_state.date_range = (all_start, all_end)
-            st.session_state.date_filter_is_active = True
-            st.rerun()
+s1.button("MTD", use_container_width=True, disabled=global_search_active, type="primary",
+          on_click=apply_date_range, args=(today_for_shortcuts.replace(day=1), today_for_shortcuts))
+s2.button("YTD", use_container_width=True, disabled=global_search_active, type="primary",
+          on_click=apply_date_range, args=(today_for_shortcuts.replace(month=1, day=1), today_for_shortcuts))
+s3.button("ALL", use_container_width=True, disabled=global_search_active, type="primary",
+          on_click=apply_date_range,
+          args=(st.session_state.get('min_data_date_for_filter', today_for_shortcuts.replace(year=today_for_shortcuts.year-1)),
+                st.session_state.get('max_data_date_for_filter', today_for_shortcuts)))
 
-current_session_start, current_session_end = st.session_state.date_range
 min_dt_for_widget = st.session_state.get('min_data_date_for_filter')
 max_dt_for_widget = st.session_state.get('max_data_date_for_filter')
-val_start_widget = current_session_start
-if min_dt_for_widget and current_session_start < min_dt_for_widget:
-    val_start_widget = min_dt_for_widget
-val_end_widget = current_session_end
-if max_dt_for_widget and current_session_end > max_dt_for_widget:
-    val_end_widget = max_dt_for_widget
-if val_start_widget > val_end_widget:
-    val_start_widget = val_end_widget
-
-selected_date_range_tuple = st.sidebar.date_input(
+val_start_widget, val_end_widget = clamp_to_data_bounds(*st.session_state.date_range)
+# Keep the stored range in step with the clamped widget value (no rerun needed; nothing read it yet)
+if not global_search_active and (val_start_widget, val_end_widget) != tuple(st.session_state.date_range):
+    apply_date_range(val_start_widget, val_end_widget)
+# The widget's state is its value; the writers above keep it in step with date_range
+st.session_state.setdefault("date_selector_custom", (val_start_widget, val_end_widget))
+
+st.sidebar.date_input(
     "Custom Date Range (Onboarding):",
-    value=(val_start_widget, val_end_widget),
     min_value=min_dt_for_widget, max_value=max_dt_for_widget,
     key="date_selector_custom",
     disabled=global_search_active,
+    on_change=on_custom_date_change,
     help="Select start/end dates."
 )
-if (not global_search_active and isinstance(selected_date_range_tuple, tuple) and
-        len(selected_date_range_tuple) == 2 and selected_date_range_tuple != st.session_state.date_range):
-    st.session_state.date_range = selected_date_range_tuple
-    st.session_state.date_filter_is_active = True
-    st.rerun()
 
-start_dt_filter, end_dt_filter = st.session_state.date_range
+@st.cache_data(show_spinner=False)
+def category_filter_options(data_version, col_key, _values):
+    """Sorted, non-blank choices for a categorical filter column. _values is not hashed; data_version keys it."""
+    labels = _values.cat.categories.to_series()
+    if col_key == 'status':
+        labels = labels.str.replace(STATUS_EMOJI_RE, "", regex=True).str.strip()
+    return sorted({v for v in labels if str(v).strip()})
+
+def apply_category_filter(col_key):
+    st.session_state[f"{col_key}_filter"] = st.session_state[f"{col_key}_category_filter_widget"]
 
 category_filters_map = {'repName':'Representative(s)', 'status':'Status(es)', 'clientSentiment':'Client Sentiment(s)'}
 for col_key, label_text in category_filters_map.items():
     options = []
-    if not df_original.empty and col_key in df_original.columns and df_original[col_key].notna().any():
-        if col_key == 'status':
-            options = sorted([v for v in df_original[col_key].astype(str).str.replace(r"✅|⏳|❌", "", regex=True).str.strip().dropna().unique() if str(v).strip()])
-        else:
-            options = sorted([v for v in df_original[col_key].astype(str).dropna().unique() if str(v).strip()])
+    if not df_original.empty and col_key in df_original.columns:
+        options = category_filter_options(st.session_state.data_version, col_key, df_original[col_key])
     current_sel = st.session_state.get(f"{col_key}_filter", [])
     valid_current_sel = [s for s in current_sel if s in options]
-    new_sel = st.sidebar.multiselect(
+    # The keyed multiselect ignores default= after its first run; its state is its value,
+    # so keep that in step with the applied filter (and the current options) directly.
+    key_widget = f"{col_key}_category_filter_widget"
+    if st.session_state.get(key_widget) != valid_current_sel:
+        st.session_state[key_widget] = valid_current_sel
+    st.sidebar.multiselect(
         f"Filter by {label_text}:",
-        options=options, default=valid_current_sel,
-        key=f"{col_key}_category_filter_widget",
+        options=options,
+        key=key_widget,
         disabled=global_search_active or not options,
+        on_change=apply_category_filter, args=(col_key,),
         help=f"Select {label_text}." if options else f"No {label_text} data."
     )
-    if not global_search_active and new_sel != valid_current_sel:
-        st.session_state[f"{col_key}_filter"] = new_sel
-        st.rerun()
-    elif global_search_active and st.session_state.get(f"{col_key}_filter") != new_sel:
-        st.session_state[f"{col_key}_filter"] = new_sel
-
-def clear_all_filters_and_search():
-    ds_cleared, de_cleared = get_default_date_range(st.session_state.df_original.get('onboarding_date_only'))
-    st.session_state.date_range = (ds_cleared, de_cleared)
-    st.session_state.date_filter_is_active = False
-    st.session_state.licenseNumber_search = ""; st.session_state.storeName_search = ""; st.session_state.show_global_search_dialog = False
-    for cat_key in category_filters_map: st.session_state[f"{cat_key}_filter"]=[]
-    st.session_state.selected_transcript_key_dialog_global_search = None; st.session_state.selected_transcript_key_filtered_analysis = None
-    st.session_state.active_tab = TAB_OVERVIEW
 
-st.sidebar.markdown("---"); st.sidebar.header("🔄 Data Management")
-if st.sidebar.button("Refresh Data from Source", use_container_width=True, type="primary"):
+def clear_all_filters_and_search(default_range=None):
+    """Reset search, filters and record pickers; default_range skips re-deriving the date default.
+
+    Runs as an on_click callback, before the keyed widgets are drawn, so their state is reset too.
+    """
+    if default_range is None:
+        default_range = get_default_date_range(*onboarding_date_bounds(st.session_state.df_original))
+    st.session_state.update({
+        "date_range": tuple(default_range), "date_filter_is_active": False,
+        "date_selector_custom": clamp_to_data_bounds(*default_range),
+        "licenseNumber_search": "", "storeName_search": "", "show_global_search_dialog": False,
+        **{f"{cat_key}_filter": [] for cat_key in category_filters_map},
+        **{f"{cat_key}_category_filter_widget": [] for cat_key in category_filters_map},
+        "selected_transcript_key_dialog_global_search": None, "selected_transcript_key_filtered_analysis": None,
+    })
+
+def refresh_data_from_source():
     st.cache_data.clear()
+    st.cache_resource.clear()
+    clear_sheet_snapshot()
     st.session_state.data_loaded = False
     st.session_state.last_data_refresh_time = None
+    st.session_state.data_version = None
     st.session_state.df_original = pd.DataFrame()
-    clear_all_filters_and_search()
-    st.rerun()
+    # The frame was just dropped, so the default is the bound-free one; the loader
+    # re-derives it from the fresh data's bounds in the rerun the click triggers.
+    clear_all_filters_and_search((default_s_init, default_e_init))
+
+st.sidebar.markdown("---"); st.sidebar.header("🔄 Data Management")
+st.sidebar.button("Refresh Data from Source", use_container_width=True, type="primary",
+                  on_click=refresh_data_from_source)
 
 if st.session_state.get('data_loaded', False) and st.session_state.get('last_data_refresh_time'):
     refresh_time_pst = st.session_state.last_data_refresh_time.astimezone(PST_TIMEZONE)
@@ -651,185 +1019,301 @@ elif df_original.empty:
     st.stop()
 
 # ---------------- Active Filters Summary ----------------
-if st.session_state.active_tab not in ALL_TABS: st.session_state.active_tab = TAB_OVERVIEW
-try:
-    current_tab_idx = ALL_TABS.index(st.session_state.active_tab)
-except ValueError:
-    current_tab_idx = 0; st.session_state.active_tab = TAB_OVERVIEW
-selected_tab = st.radio("Navigation:", ALL_TABS, index=current_tab_idx, horizontal=True, key="main_tab_selector")
-if selected_tab != st.session_state.active_tab:
-    st.session_state.active_tab = selected_tab
-    st.rerun()
+# The sidebar is done mutating state; read what the rest of the run needs once.
+license_search_term = st.session_state.get("licenseNumber_search", "")
+store_search_term = st.session_state.get("storeName_search", "")
+date_range_sel = tuple(st.session_state.date_range)
+category_selections = {k: tuple(st.session_state.get(f"{k}_filter", [])) for k in category_filters_map}
+global_search_active = bool(license_search_term or store_search_term)
 
 summary_parts = []
-global_search_active = bool(st.session_state.get("licenseNumber_search", "") or st.session_state.get("storeName_search", ""))
 if global_search_active:
     terms = []
-    if st.session_state.get("licenseNumber_search", ""): terms.append(f"License: '{st.session_state['licenseNumber_search']}'")
-    if st.session_state.get("storeName_search", ""): terms.append(f"Store: '{st.session_state['storeName_search']}'")
+    if license_search_term: terms.append(f"License: '{license_search_term}'")
+    if store_search_term: terms.append(f"Store: '{store_search_term}'")
     summary_parts.append(f"🔍 Global Search: {'; '.join(terms)}")
     summary_parts.append("(Filters overridden. Results in pop-up.)")
 else:
-    start_display, end_display = st.session_state.date_range[0].strftime('%b %d, %Y'), st.session_state.date_range[1].strftime('%b %d, %Y')
+    start_display, end_display = date_range_sel[0].strftime('%b %d, %Y'), date_range_sel[1].strftime('%b %d, %Y')
     min_d = st.session_state.get('min_data_date_for_filter'); max_d = st.session_state.get('max_data_date_for_filter')
-    is_all = bool(min_d) and bool(max_d) and st.session_state.date_range == (min_d, max_d) and st.session_state.get('date_filter_is_active', False)
+    is_all = bool(min_d) and bool(max_d) and date_range_sel == (min_d, max_d) and st.session_state.get('date_filter_is_active', False)
     summary_parts.append("🗓️ Dates: ALL Data" if is_all else f"🗓️ Dates: {start_display} to {end_display}")
     act = []
     for col_key, label_text in category_filters_map.items():
-        sel = st.session_state.get(f"{col_key}_filter", [])
+        sel = category_selections[col_key]
         if sel: act.append(f"{label_text.replace('(s)','').strip()}: {', '.join(sel)}")
     if act: summary_parts.append(" | ".join(act))
 final_summary_message = " | ".join(filter(None, summary_parts)) or "Displaying data (default date range)."
 st.markdown(f"<div class='active-filters-summary'>ℹ️ {final_summary_message}</div>", unsafe_allow_html=True)
 
 # ---------------- Apply Filters / Search ----------------
+# Cheap, hashable digest of everything that shapes df_filtered; used as a cache key
+# so reruns that don't touch the filters (tab switches, record picks) hit the cache.
+filter_signature = (
+    st.session_state.data_version,
+    license_search_term, store_search_term,
+    date_range_sel,
+    tuple(category_selections.values()),
+)
+
+# Plain NumPy views of the filterable columns, built once per data_version:
+#   sorted_days / date_order: dated rows' onboarding days, sorted, and their row positions
+#   cat_codes: (rows x category filters) int32 category codes, -1 for missing
+#   cat_labels: per category filter, the labels its codes index (status without emoji)
+FilterArrays = namedtuple("FilterArrays", ["sorted_days", "date_order", "cat_codes", "cat_labels"])
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def filter_arrays(data_version, _df):
+    """FilterArrays for the loaded frame; _df is not hashed, data_version keys it.
+
+    Any date range then becomes two binary searches over the sorted days, and each
+    category filter an integer-code test, with no pandas dispatch on the rerun path.
+    """
+    days = _df['onboarding_date_only'].to_numpy()
+    dated = np.flatnonzero(~np.isnat(days))
+    order = dated[np.argsort(days[dated], kind='stable')]
+    codes = np.full((len(_df), len(category_filters_map)), -1, dtype=np.int32)
+    labels = []
+    for j, col in enumerate(category_filters_map):
+        if col not in _df.columns:
+            labels.append(None)
+            continue
+        codes[:, j] = _df[col].cat.codes.to_numpy()
+        col_labels = _df[col].cat.categories
+        if col == 'status':
+            col_labels = col_labels.str.replace(STATUS_EMOJI_RE, "", regex=True).str.strip()
+        labels.append(col_labels)
+    return FilterArrays(days[order], order, codes, tuple(labels))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def filtered_row_positions(filter_sig, _df):
+    """Row positions of _df matching the search terms / filters packed into filter_sig.
+
+    filter_sig carries every predicate input (and data_version), so it is the whole
+    cache key and _df is not hashed; only the small positions array is stored.
+    """
+    data_version, ln_search, sn_search, (start_dt, end_dt), cat_selections = filter_sig
+    # AND every predicate into one mask over _df and slice once, rather than
+    # re-slicing (and copying) a shrinking frame after each filter.
+    mask = np.ones(len(_df), dtype=bool)
+    if ln_search or sn_search:
+        ln_term = ln_search.strip().lower()
+        sn_term = sn_search.strip()
+        if ln_term and "licenseNumber_lc" in _df.columns:
+            mask &= _df['licenseNumber_lc'].str.contains(ln_term, regex=False, na=False).to_numpy()
+        if sn_term and "storeName" in _df.columns:
+            mask &= (_df['storeName'] == sn_term).to_numpy()
+    else:
+        arrays = filter_arrays(data_version, _df)
+        # has_dates is set at load time, so a sheet without dates skips the mask without a scan
+        if _df.attrs.get('has_dates', False):
+            lo = np.searchsorted(arrays.sorted_days, np.datetime64(start_dt, 'ns'), side='left')
+            hi = np.searchsorted(arrays.sorted_days, np.datetime64(end_dt, 'ns'), side='right')
+            in_range = np.zeros(len(_df), dtype=bool)
+            in_range[arrays.date_order[lo:hi]] = True
+            mask &= in_range
+        active = [j for j, (labels, sel) in enumerate(zip(arrays.cat_labels, cat_selections))
+                  if sel and labels is not None]
+        if active:
+            # Match each selection against its few categories into a per-code lookup row,
+            # then test every row's codes against all active filters in a single pass.
+            width = 1 + max(len(arrays.cat_labels[j]) for j in active)
+            bits = np.zeros((len(active), width), dtype=np.uint8)
+            for r, j in enumerate(active):
+                labels = arrays.cat_labels[j]
+                bits[r, 1:len(labels) + 1] = labels.isin(list(cat_selections[j]))
+            codes = np.ascontiguousarray(arrays.cat_codes[:, active])
+            mask = category_mask_kernel(codes, bits, mask)
+    return np.flatnonzero(mask)
+
 df_filtered = pd.DataFrame(); df_global_search_results_display = pd.DataFrame()
 if not df_original.empty:
+    df_filtered = df_original.iloc[filtered_row_positions(filter_signature, df_original)]
     if global_search_active:
-        df_temp = df_original.copy()
-        ln_term = st.session_state.get("licenseNumber_search", "").strip().lower()
-        sn_term = st.session_state.get("storeName_search", "").strip()
-        if ln_term and "licenseNumber" in df_temp.columns:
-            df_temp = df_temp[df_temp['licenseNumber'].astype(str).str.lower().str.contains(ln_term, na=False)]
-        if sn_term and "storeName" in df_temp.columns:
-            df_temp = df_temp[df_temp['storeName'] == sn_term]
-        df_global_search_results_display = df_temp.copy()
-        df_filtered = df_global_search_results_display.copy()
-    else:
-        df_temp = df_original.copy()
-        if 'onboarding_date_only' in df_temp.columns and df_temp['onboarding_date_only'].notna().any():
-            d = pd.to_datetime(df_temp['onboarding_date_only'], errors='coerce').dt.date
-            valid = d.notna()
-            cond = pd.Series(False, index=df_temp.index)
-            if valid.any():
-                cond[valid] = (d[valid] >= start_dt_filter) & (d[valid] <= end_dt_filter)
-            df_temp = df_temp[cond]
-        for col_name_cat, _ in category_filters_map.items():
-            sel = st.session_state.get(f"{col_name_cat}_filter", [])
-            if sel and col_name_cat in df_temp.columns:
-                if col_name_cat == 'status':
-                    df_temp = df_temp[df_temp[col_name_cat].astype(str).str.replace(r"✅|⏳|❌", "", regex=True).str.strip().isin(sel)]
-                else:
-                    df_temp = df_temp[df_temp[col_name_cat].astype(str).isin(sel)]
-        df_filtered = df_temp.copy()
-else:
-    df_filtered = pd.DataFrame(); df_global_search_results_display = pd.DataFrame()
+        df_global_search_results_display = df_filtered
 
 # ---------------- MTD Metrics ----------------
-today_mtd = date.today()
-mtd_start = today_mtd.replace(day=1)
-prev_end = mtd_start - timedelta(days=1)
-prev_start = prev_end.replace(day=1)
-df_mtd_data = pd.DataFrame(); df_prev_mtd_data = pd.DataFrame()
-if not df_original.empty and 'onboarding_date_only' in df_original.columns and df_original['onboarding_date_only'].notna().any():
-    d_all = pd.to_datetime(df_original['onboarding_date_only'], errors='coerce').dt.date
-    valid = d_all.notna()
-    if valid.any():
-        base = df_original[valid].copy()
-        d_valid = d_all[valid]
-        mtd_mask = (d_valid >= mtd_start) & (d_valid <= today_mtd)
-        prev_mask = (d_valid >= prev_start) & (d_valid <= prev_end)
-        df_mtd_data = base[mtd_mask.values if len(mtd_mask) == len(base) else mtd_mask[base.index]]
-        df_prev_mtd_data = base[prev_mask.values if len(prev_mask) == len(base) else prev_mask[base.index]]
-total_mtd, sr_mtd, score_mtd, days_to_confirm_mtd = calculate_metrics(df_mtd_data)
-total_prev_mtd, _, _, _ = calculate_metrics(df_prev_mtd_data)
-delta_onboardings_mtd = (total_mtd - total_prev_mtd) if pd.notna(total_mtd) and pd.notna(total_prev_mtd) else None
+@st.cache_data(show_spinner=False, ttl=3600)
+def compute_mtd_metrics(data_version, today_mtd, _df):
+    """Month-to-date metrics plus the onboarding delta against the same span of last month.
 
-# ---------------- Table helpers ----------------
-def get_cell_style_class(column_name, value):
-    val_str = str(value).strip().lower()
-    if pd.isna(value) or val_str == "" or val_str == "na":
-        return "cell-req-na"
+    Depends only on the loaded data and the calendar day, so it is keyed on
+    (data_version, today) and _df is not hashed.
+    """
+    df = _df
+    mtd_start = today_mtd.replace(day=1)
+    prev_end = mtd_start - timedelta(days=1)
+    prev_start = prev_end.replace(day=1)
+    if df.empty or 'onboarding_date_only' not in df.columns:
+        return 0, 0.0, pd.NA, pd.NA, 0
+    # Label every row once (0 = this month to date, 1 = last month, 2 = neither), then reduce the
+    # metric arrays per bucket instead of slicing the whole frame twice. NaT lands in bucket 2.
+    dates = df['onboarding_date_only'].to_numpy()
+    bucket = np.select(
+        [(dates >= np.datetime64(mtd_start)) & (dates <= np.datetime64(today_mtd)),
+         (dates >= np.datetime64(prev_start)) & (dates <= np.datetime64(prev_end))],
+        [0, 1], 2
+    )
+    in_mtd = bucket == 0
+    total_mtd, sr_mtd, score_mtd, days_to_confirm_mtd = metrics_from_arrays(*(a[in_mtd] for a in metric_arrays(df)))
+    delta_onboardings_mtd = total_mtd - int(np.count_nonzero(bucket == 1))
+    return total_mtd, sr_mtd, score_mtd, days_to_confirm_mtd, delta_onboardings_mtd
 
-    if column_name == 'score':
-        try:
-            score_num = float(value)
-        except:
-            return ""
-        if score_num >= 8:
-            return "cell-score-good"
-        elif score_num >= 4:
-            return "cell-score-medium"
+# ---------------- Table helpers ----------------
+def map_status(status_val):
+    s = str(status_val).strip().lower()
+    if s == 'confirmed':
+        return "✅ Confirmed"
+    if s == 'pending':
+        return "⏳ Pending"
+    if s == 'failed':
+        return "❌ Failed"
+    return status_val
+
+def styled_status(df_in):
+    """Emoji status labels aligned to df_in's index, computed without copying df_in."""
+    if 'status' not in df_in.columns:
+        return pd.Series("", index=df_in.index)
+    return df_in['status'].map(map_status)
+
+def column_style_classes(column_name, values):
+    """CSS class for every cell of one table column, decided with whole-column masks."""
+    text = values.astype("string").str.strip().str.lower().fillna("")
+    blank = (values.isna() | text.eq("") | text.eq("na")).to_numpy(dtype=bool)
+
+    if column_name in ('score', 'days_to_confirmation'):
+        num = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        parsed = ~np.isnan(num)
+        if column_name == 'score':
+            classes = np.select([num >= 8, num >= 4, parsed],
+                                ["cell-score-good", "cell-score-medium", "cell-score-bad"], "")
         else:
-            return "cell-score-bad"
-
+            classes = np.select([num <= 7, num <= 14, parsed],
+                                ["cell-days-good", "cell-days-medium", "cell-days-bad"], "")
     elif column_name == 'clientSentiment':
-        if val_str == 'positive':
-            return "cell-sentiment-positive"
-        elif val_str == 'neutral':
-            return "cell-sentiment-neutral"
-        elif val_str == 'negative':
-            return "cell-sentiment-negative"
-
-    elif column_name == 'days_to_confirmation':
-        try:
-            days_num = float(value)
-        except:
-            return ""
-        if days_num <= 7:
-            return "cell-days-good"
-        elif days_num <= 14:
-            return "cell-days-medium"
-        else:
-            return "cell-days-bad"
-
+        classes = np.select([text.eq('positive').to_numpy(dtype=bool), text.eq('neutral').to_numpy(dtype=bool),
+                             text.eq('negative').to_numpy(dtype=bool)],
+                            ["cell-sentiment-positive", "cell-sentiment-neutral", "cell-sentiment-negative"], "")
     elif column_name in ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS:
-        if val_str in ['true', '1', 'yes', 'x', 'completed', 'done']:
-            return "cell-req-met"
-        elif val_str in ['false', '0', 'no']:
-            return "cell-req-not-met"
-
+        classes = np.select([text.isin(REQUIREMENT_MET_VALUES).to_numpy(dtype=bool),
+                             text.isin(REQUIREMENT_NOT_MET_VALUES).to_numpy(dtype=bool)],
+                            ["cell-req-met", "cell-req-not-met"], "")
     elif column_name == 'status':
-        return "cell-status"
-
-    return ""
-
-
-def display_html_table_and_details(df_to_display, context_key_prefix=""):
-    if df_to_display is None or df_to_display.empty:
-        label = context_key_prefix.replace('_', ' ').title().replace('Tab', '').replace('Dialog', '')
-        if not df_original.empty:
-            st.markdown(
-                f"<div class='no-data-message'>📊 No data for {label}. Try different filters! 📊</div>",
-                unsafe_allow_html=True
-            )
-        return
+        classes = np.full(len(values), "cell-status", dtype=object)
+    else:
+        classes = np.full(len(values), "", dtype=object)
+    return np.where(blank, "cell-req-na", classes)
 
-    dfv = df_to_display.copy().reset_index(drop=True)
+def column_display_text(column_name, values):
+    """Cell text for one table column; score / days get fixed decimals where numeric."""
+    out = values.astype(str).to_numpy(dtype=object)
+    if column_name in ('score', 'days_to_confirmation'):
+        num = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        ok = ~np.isnan(num)
+        out[ok] = np.char.mod('%.1f' if column_name == 'score' else '%.0f', num[ok])
+    return out
 
-    def map_status(status_val):
-        s = str(status_val).strip().lower()
-        if s == 'confirmed':
-            return "✅ Confirmed"
-        if s == 'pending':
-            return "⏳ Pending"
-        if s == 'failed':
-            return "❌ Failed"
-        return status_val
 
-    if 'status' in dfv.columns:
-        dfv['status_styled'] = dfv['status'].apply(map_status)
-    else:
-        dfv['status_styled'] = ""
+@lru_cache(maxsize=8)
+def display_columns(columns):
+    """Ordered table columns (as a tuple) for a frame with these column names.
 
+    A pure function of the column-name tuple, so a plain in-process lru_cache does; unlike
+    st.cache_data it hands back the stored tuple without pickling it on every hit.
+    """
     preferred_cols = [
         'onboardingDate', 'repName', 'storeName', 'licenseNumber', 'status_styled',
         'score', 'clientSentiment', 'days_to_confirmation', 'contactName', 'contactNumber',
         'confirmedNumber', 'deliveryDate', 'confirmationTimestamp'
     ] + ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS
 
-    cols_present = dfv.columns.tolist()
+    cols_present = list(columns) + ['status_styled']
     final_cols = [c for c in preferred_cols if c in cols_present]
-    excluded_suffixes = ('_dt', '_utc', '_str_original', '_date_only', '_styled')
+    excluded_suffixes = ('_dt', '_utc', '_str_original', '_date_only', '_styled', '_flag', '_lc')
     others = [
         c for c in cols_present
         if c not in final_cols and not c.endswith(excluded_suffixes)
-        and c not in ['fullTranscript', 'summary', 'status', 'onboardingWelcome']
+        and c not in ['fullTranscript', 'summary', 'status', 'onboardingWelcome', 'is_confirmed']
     ]
     final_cols.extend(others)
-    final_cols = list(dict.fromkeys(final_cols))
+    return tuple(dict.fromkeys(final_cols))
+
 
-    if not final_cols or dfv[final_cols].empty:
+def results_table_html(columns, df):
+    """Styled HTML results table for the given display columns."""
+    status_styled = styled_status(df)
+    html = ["<div class='custom-table-container'><table class='custom-styled-table'><thead><tr>"]
+    for c in columns:
+        html.append(f"<th>{TABLE_HEADER_LABELS.get(c, c.replace('_', ' ').title())}</th>")
+    html.append("</tr></thead><tbody>")
+
+    # Class and text are decided per column with vector ops; the loop below only stitches strings.
+    cells = []
+    for c in columns:
+        base_col = 'status' if c == 'status_styled' else c
+        shown = status_styled if c == 'status_styled' else df[c]
+        classes = column_style_classes(base_col, df[base_col] if base_col in df.columns else shown)
+        texts = column_display_text(c, shown)
+        cells.append([f"<td class='{k}'>{v}</td>" for v, k in zip(texts, classes)])
+    html.extend(f"<tr>{''.join(row)}</tr>" for row in zip(*cells))
+    html.append("</tbody></table></div>")
+    return "".join(html)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_results_table_html(filter_sig, context_key_prefix, columns, page, _df):
+    # Same keying as the CSV export (plus the page): reruns that keep the filters reuse the
+    # rendered markup. _df is already the page's rows.
+    return results_table_html(columns, _df)
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def transcript_html(transcript):
+    """Speaker-tagged transcript markup; keyed on the text itself, so re-viewing a record is a lookup."""
+    parts = ["<div class='transcript-pane-container'><div class='transcript-container'>"]
+    processed = transcript.replace('\\n', '\n')
+    for line in processed.split('\n'):
+        t = line.strip()
+        if not t:
+            continue
+        seg = t.split(":", 1)
+        speaker = f"<strong>{seg[0].strip()}:</strong>" if len(seg) == 2 else ""
+        msg = seg[1].strip() if len(seg) == 2 else t
+        parts.append(f"<p class='transcript-line'>{speaker} {msg}</p>")
+    parts.append("</div></div>")
+    return "".join(parts)
+
+def record_option_map(df):
+    """'Idx N: store (date)' picker labels mapped to index labels, built column-wise."""
+    def text_col(col):
+        return df[col].astype(str) if col in df.columns else pd.Series('N/A', index=df.index)
+    labels = "Idx " + pd.Series(df.index.astype(str), index=df.index) + ": " + text_col('storeName') + " (" + text_col('onboardingDate') + ")"
+    return dict(zip(labels.tolist(), df.index.tolist()))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def record_picker_options(filter_sig, context_key_prefix, _df):
+    # Keyed on the filter state like the other per-view caches; _df is not hashed.
+    return record_option_map(_df)
+
+def mark_styled_table_touched(key_styled):
+    st.session_state[f"{key_styled}_touched"] = True
+
+def display_html_table_and_details(df_to_display, context_key_prefix="", filter_sig=None):
+    if df_to_display is None or df_to_display.empty:
+        label = context_key_prefix.replace('_', ' ').title().replace('Tab', '').replace('Dialog', '')
+        if not df_original.empty:
+            st.markdown(
+                f"<div class='no-data-message'>📊 No data for {label}. Try different filters! 📊</div>",
+                unsafe_allow_html=True
+            )
+        return
+
+    # Read-only view of the caller's frame; the original index labels key the record picker,
+    # so only fall back to a fresh positional index if those labels could be ambiguous.
+    dfv = df_to_display if df_to_display.index.is_unique else df_to_display.reset_index(drop=True)
+    status_styled = styled_status(dfv)
+
+    final_cols = display_columns(tuple(dfv.columns))
+
+    if not final_cols:
         label = context_key_prefix.replace('_', ' ').title().replace('Tab', '').replace('Dialog', '')
         st.markdown(
             f"<div class='no-data-message'>📋 No columns/data for {label}. 📋</div>",
@@ -837,48 +1321,61 @@ def display_html_table_and_details(df_to_display, context_key_prefix=""):
         )
         return
 
-    header_map = {
-        'status_styled': 'Status',
-        'onboardingDate': 'Onboarding Date',
-        'repName': 'Rep Name',
-        'storeName': 'Store Name',
-        'licenseNumber': 'License No.',
-        'clientSentiment': 'Sentiment',
-        'days_to_confirmation': 'Days to Confirm',
-        'contactName': 'Contact Name',
-        'contactNumber': 'Contact No.',
-        'confirmedNumber': 'Confirmed No.',
-        'deliveryDate': 'Delivery Date',
-        'confirmationTimestamp': 'Confirmation Time'
-    }
-    for req_key, details in KEY_REQUIREMENT_DETAILS.items():
-        header_map[req_key] = details.get("chart_label", req_key)
-
-    html = ["<div class='custom-table-container'><table class='custom-styled-table'><thead><tr>"]
-    for c in final_cols:
-        html.append(f"<th>{header_map.get(c, c.replace('_', ' ').title())}</th>")
-    html.append("</tr></thead><tbody>")
-
-    for _, row in dfv.iterrows():
-        html.append("<tr>")
-        for c in final_cols:
-            base_col = 'status' if c == 'status_styled' else c
-            val = row.get(c, "")
-            cls = get_cell_style_class(base_col, row.get(base_col, val))
-            if c == 'score' and pd.notna(val):
-                try:
-                    val = f"{float(val):.1f}"
-                except:
-                    pass
-            elif c == 'days_to_confirmation' and pd.notna(val):
-                try:
-                    val = f"{float(val):.0f}"
-                except:
-                    pass
-            html.append(f"<td class='{cls}'>{val}</td>")
-        html.append("</tr>")
-    html.append("</tbody></table></div>")
-    st.markdown("".join(html), unsafe_allow_html=True)
+    # Styled HTML by default only while the table is small. The default follows the current
+    # row count until the user flips the toggle; from then on it's the user's call.
+    key_styled = f"{context_key_prefix}_styled_table"
+    if not st.session_state.get(f"{key_styled}_touched", False):
+        st.session_state[key_styled] = len(dfv) <= LARGE_TABLE_ROW_THRESHOLD
+    styled_table = st.toggle(
+        "🎨 Styled table", key=key_styled,
+        on_change=mark_styled_table_touched, args=(key_styled,),
+        help="Colour-coded HTML table. Turn off for the faster native grid (sortable, with progress bars)."
+    )
+    if not styled_table:
+        # Native grid: no per-cell HTML generation, with progress bars standing in
+        # for the score / days cell colouring.
+        table = dfv.reindex(columns=list(final_cols))
+        if 'status_styled' in table.columns:
+            table['status_styled'] = status_styled
+        column_config = {c: TABLE_HEADER_LABELS.get(c, c.replace('_', ' ').title()) for c in final_cols}
+        if 'score' in table.columns:
+            column_config['score'] = st.column_config.ProgressColumn(
+                TABLE_HEADER_LABELS.get('score', 'Score'), min_value=0, max_value=10, format="%.1f")
+        if 'days_to_confirmation' in table.columns:
+            max_days = table['days_to_confirmation'].max()
+            column_config['days_to_confirmation'] = st.column_config.ProgressColumn(
+                TABLE_HEADER_LABELS['days_to_confirmation'], min_value=0,
+                max_value=float(max_days) if pd.notna(max_days) and max_days > 0 else 1.0, format="%.0f")
+        # Checklist columns as native checkboxes from the load-time flags. Sheet cells come back
+        # as "" rather than missing, so blank / "na" cells are masked here as in the HTML table
+        # (the flags keep counting them as not met for the completion chart).
+        for c in ORDERED_CHART_REQUIREMENTS:
+            if c in table.columns and f"{c}_flag" in dfv.columns:
+                flag = dfv[f"{c}_flag"]
+                raw_text = dfv[c].astype("string").str.strip().str.lower().fillna("")
+                blank = flag.eq(REQUIREMENT_FLAG_BLANK) | raw_text.eq("") | raw_text.eq("na")
+                table[c] = flag.eq(1).astype("boolean").mask(blank)
+                column_config[c] = st.column_config.CheckboxColumn(TABLE_HEADER_LABELS.get(c, c))
+        st.dataframe(table, use_container_width=True, height=350, column_config=column_config)
+    else:
+        # Render (and ship to the browser) one page of rows at a time
+        page, page_rows = 1, dfv
+        n_pages = -(-len(dfv) // TABLE_PAGE_SIZE)
+        if n_pages > 1:
+            # The keyed number_input ignores value= after its first run, so go back to page 1
+            # explicitly whenever the rows being paged change.
+            key_page = f"{context_key_prefix}_table_page"
+            if st.session_state.get(f"{key_page}_for") != (filter_sig, n_pages):
+                st.session_state[key_page] = 1
+                st.session_state[f"{key_page}_for"] = (filter_sig, n_pages)
+            page = st.number_input(
+                f"Page (of {n_pages}, {TABLE_PAGE_SIZE} rows each)", min_value=1, max_value=n_pages,
+                step=1, key=key_page
+            )
+            page_rows = dfv.iloc[(page - 1) * TABLE_PAGE_SIZE: page * TABLE_PAGE_SIZE]
+        table_html = (build_results_table_html(filter_sig, context_key_prefix, final_cols, page, page_rows)
+                      if filter_sig is not None else results_table_html(final_cols, page_rows))
+        st.markdown(table_html, unsafe_allow_html=True)
 
     st.markdown("---")
     st.subheader("📄 View Full Record Details")
@@ -886,46 +1383,32 @@ def display_html_table_and_details(df_to_display, context_key_prefix=""):
     if key_sel not in st.session_state:
         st.session_state[key_sel] = None
 
-    auto_selected_this_run = False
-    if len(dfv) == 1:
-        r = dfv.iloc[0]
-        auto_key = f"Idx 0: {r.get('storeName','N/A')} ({r.get('onboardingDate','N/A')})"
-        if st.session_state[key_sel] != auto_key:
-            st.session_state[key_sel] = auto_key
-            auto_selected_this_run = True
-
-    auto_once_key = f"{context_key_prefix}_auto_selected_once"
-    if auto_selected_this_run and not st.session_state.get(auto_once_key, False):
-        st.session_state[auto_once_key] = True
-        st.rerun()
-    elif len(dfv) != 1:
-        st.session_state[auto_once_key] = False
-
     if 'fullTranscript' in dfv.columns or 'summary' in dfv.columns:
-        opts = {
-            f"Idx {idx}: {row.get('storeName','N/A')} ({row.get('onboardingDate','N/A')})": idx
-            for idx, row in dfv.iterrows()
-        }
+        opts = (record_picker_options(filter_sig, context_key_prefix, dfv) if filter_sig is not None
+                else record_option_map(dfv))
         if opts:
             opt_list = [None] + list(opts.keys())
-            cur = st.session_state[key_sel]
-            try:
-                cur_idx = opt_list.index(cur)
-            except ValueError:
-                cur_idx = 0
+            if st.session_state[key_sel] not in opts:
                 st.session_state[key_sel] = None
+            # A single match is pre-selected once; this runs before the widget reads its state,
+            # so the details render in this same run without a follow-up st.rerun(). Remembering
+            # which option was pre-selected keeps a selection the user cleared cleared.
+            key_auto = f"{key_sel}_auto_selected"
+            if len(opts) == 1:
+                only_opt = next(iter(opts))
+                if st.session_state[key_sel] is None and st.session_state.get(key_auto) != only_opt:
+                    st.session_state[key_sel] = only_opt
+                st.session_state[key_auto] = only_opt
+            else:
+                st.session_state[key_auto] = None
 
-            sel = st.selectbox(
+            # The widget writes straight to key_sel, so a pick needs no extra st.rerun().
+            st.selectbox(
                 "Select record to view details:",
                 options=opt_list,
-                index=cur_idx,
                 format_func=lambda x: "📄 Choose an entry..." if x is None else x,
-                key=f"transcript_selector_{context_key_prefix}"
+                key=key_sel
             )
-            if sel != st.session_state[key_sel]:
-                st.session_state[key_sel] = sel
-                st.session_state[auto_once_key] = False
-                st.rerun()
 
             if st.session_state[key_sel]:
                 idx = opts[st.session_state[key_sel]]
@@ -935,7 +1418,7 @@ def display_html_table_and_details(df_to_display, context_key_prefix=""):
                     "Store": row.get('storeName', "N/A"),
                     "Rep": row.get('repName', "N/A"),
                     "Score": (f"{float(row.get('score')):.1f}" if pd.notna(row.get('score')) else "N/A"),
-                    "Status": row.get('status_styled', "N/A"),
+                    "Status": status_styled.get(idx, "N/A"),
                     "Sentiment": row.get('clientSentiment', "N/A")
                 }
                 chunks = ["<div class='transcript-summary-grid'>"]
@@ -949,36 +1432,27 @@ def display_html_table_and_details(df_to_display, context_key_prefix=""):
                 chunks.append("</div>")
                 st.markdown("".join(chunks), unsafe_allow_html=True)
 
-                st.markdown("<div class='transcript-details-section'>", unsafe_allow_html=True)
-                st.markdown("<h6>Key Requirement Checks:</h6>", unsafe_allow_html=True)
+                # One markdown element for the whole checklist (separate st.markdown calls can't
+                # wrap each other, and each one is its own element to diff and send)
+                checks = ["<div class='transcript-details-section'><h6>Key Requirement Checks:</h6>"]
                 for c in ORDERED_TRANSCRIPT_VIEW_REQUIREMENTS:
                     det = KEY_REQUIREMENT_DETAILS.get(c, {})
                     desc = det.get("description", c.replace('_', ' ').title())
                     typ = det.get("type", "")
                     raw = row.get(c, pd.NA)
                     s = str(raw).strip().lower()
-                    is_met = s in ['true', '1', 'yes', 'x', 'completed', 'done']
+                    is_met = s in REQUIREMENT_MET_VALUES
                     emoji = "✅" if is_met else ("❌" if pd.notna(raw) and s != "" else "➖")
                     tag = f"<span class='type'>[{typ}]</span>" if typ else ""
-                    st.markdown(f"<div class='requirement-item'>{emoji} {desc} {tag}</div>", unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
+                    checks.append(f"<div class='requirement-item'>{emoji} {desc} {tag}</div>")
+                checks.append("</div>")
+                st.markdown("".join(checks), unsafe_allow_html=True)
 
                 st.markdown("---")
                 st.markdown("<h5>🎙️ Full Transcript:</h5>", unsafe_allow_html=True)
                 transcript = str(row.get('fullTranscript', '')).strip()
                 if transcript and transcript.lower() not in ['na', 'n/a', '']:
-                    parts = ["<div class='transcript-pane-container'><div class='transcript-container'>"]
-                    processed = transcript.replace('\\n', '\n')
-                    for line in processed.split('\n'):
-                        t = line.strip()
-                        if not t:
-                            continue
-                        seg = t.split(":", 1)
-                        speaker = f"<strong>{seg[0].strip()}:</strong>" if len(seg) == 2 else ""
-                        msg = seg[1].strip() if len(seg) == 2 else t
-                        parts.append(f"<p class='transcript-line'>{speaker} {msg}</p>")
-                    parts.append("</div></div>")
-                    st.markdown("".join(parts), unsafe_allow_html=True)
+                    st.markdown(transcript_html(transcript), unsafe_allow_html=True)
                 else:
                     st.info("ℹ️ No transcript available or empty for this record.")
         else:
@@ -987,18 +1461,162 @@ def display_html_table_and_details(df_to_display, context_key_prefix=""):
         st.markdown("<div class='no-data-message'>📜 Necessary columns ('fullTranscript'/'summary') missing. 📜</div>", unsafe_allow_html=True)
 
     st.markdown("---")
-    csv_bytes = convert_df_to_csv(dfv[final_cols])
+    csv_bytes = build_results_csv(filter_sig, context_key_prefix, final_cols, dfv)
+    parquet_bytes = build_results_parquet(filter_sig, context_key_prefix, final_cols, dfv)
     label = f"📥 Download These {context_key_prefix.replace('_',' ').title().replace('Tab','').replace('Dialog','')} Results"
-    st.download_button(
-        label=label,
-        data=csv_bytes,
-        file_name=f'{context_key_prefix}_results_{datetime.now().strftime("%Y%m%d_%H%M")}.csv',
-        mime='text/csv',
-        use_container_width=True
+    file_stem = f'{context_key_prefix}_results_{datetime.now().strftime("%Y%m%d_%H%M")}'
+    dl_csv, dl_parquet = st.columns([3, 1])
+    with dl_csv:
+        st.download_button(
+            label=label,
+            data=csv_bytes,
+            file_name=f'{file_stem}.csv',
+            mime='text/csv',
+            use_container_width=True
+        )
+    with dl_parquet:
+        st.download_button(
+            label="📦 Parquet",
+            data=parquet_bytes,
+            file_name=f'{file_stem}.parquet',
+            mime='application/vnd.apache.parquet',
+            use_container_width=True,
+            help="Typed, compressed export for pandas / BI tools."
+        )
+
+
+# ---------------- Chart Builders ----------------
+# Figures are memoized on their (small) aggregated inputs rather than on df_filtered,
+# so Streamlit's cache hashing stays cheap and unchanged data never rebuilds a chart.
+@st.cache_data(show_spinner=False, max_entries=192)
+def category_counts(filter_sig, col, _df):
+    # One value_counts pass per (filter state, column); returns plain arrays for go.* traces.
+    # Count the categorical by code (no sort over rows), then tidy the few resulting labels.
+    vc = _df[col].value_counts(sort=False)
+    if col == 'status':
+        vc.index = pd.Index(vc.index.astype(str)).str.replace(STATUS_EMOJI_RE, "", regex=True).str.strip()
+        vc = vc.groupby(level=0, sort=False).sum()
+    vc = vc[vc > 0]  # categoricals report unobserved categories with a zero count
+    vc = vc.sort_values(ascending=False, kind='stable')  # per-category, not per-row
+    return tuple(vc.index.tolist()), tuple(vc.tolist())
+
+@st.cache_data(show_spinner=False)
+def build_status_chart(labels, counts):
+    colors = [ACTIVE_PLOTLY_PRIMARY_SEQ[i % len(ACTIVE_PLOTLY_PRIMARY_SEQ)] for i in range(len(labels))]
+    fig = go.Figure(go.Bar(x=labels, y=counts, marker_color=colors), layout=PLOTLY_BASE_LAYOUT)
+    fig.update_layout(
+        title_text="Onboarding Status Distribution",
+        xaxis_title="Status", yaxis_title="Number of Onboardings"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_rep_chart(labels, counts):
+    colors = [ACTIVE_PLOTLY_QUALITATIVE_SEQ[i % len(ACTIVE_PLOTLY_QUALITATIVE_SEQ)] for i in range(len(labels))]
+    fig = go.Figure(go.Bar(x=labels, y=counts, marker_color=colors), layout=PLOTLY_BASE_LAYOUT)
+    fig.update_layout(
+        title_text="Onboardings by Representative",
+        xaxis_title="Representative", yaxis_title="Number of Onboardings"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_sentiment_chart(labels, counts):
+    colors = [ACTIVE_PLOTLY_SENTIMENT_MAP.get(str(s).lower(), '#808080') for s in labels]
+    pie = go.Figure(go.Pie(
+        labels=labels, values=counts, hole=0.4, marker_colors=colors,
+        textinfo='percent+label', textfont_size=12
+    ), layout=PLOTLY_BASE_LAYOUT)
+    pie.update_layout(title_text="Client Sentiment Breakdown")
+    return pie
+
+@st.cache_data(show_spinner=False)
+def build_key_requirements_chart(completion_rows):
+    dplot = pd.DataFrame(list(completion_rows), columns=["Key Requirement", "Completion (%)"])
+    bar = px.bar(
+        dplot.sort_values("Completion (%)", ascending=True),
+        x="Completion (%)", y="Key Requirement", orientation='h',
+        title="Key Req Completion (Confirmed Only)",
+        color_discrete_sequence=[PRIMARY_COLOR_FOR_PLOTLY]
+    )
+    bar.update_layout(
+        PLOTLY_BASE_LAYOUT,
+        yaxis={'categoryorder': 'total ascending'},
+        xaxis_ticksuffix="%"
+    )
+    return bar
+
+# Trend bin frequency -> the matching pandas period code
+TREND_PERIOD_CODES = {'D': 'D', 'W-MON': 'W-MON', 'ME': 'M'}
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def trend_counts(filter_sig, _dates):
+    """((bin_end, count), ...) and the bin frequency for the trend chart.
+
+    _dates is the filtered onboarding-day column; filter_sig fully determines it, so it is not hashed.
+    """
+    # The load-time datetime64 day column needs no re-parsing; count per period key, then
+    # fill empty periods with zero so the line doesn't bridge gaps. The span-based freq
+    # keeps the bin count small (<= 91 days, ~105 weeks, then months).
+    onb = _dates.dropna()
+    if onb.empty:
+        return (), 'D'
+    span = (onb.max() - onb.min()).days
+    freq = 'D'
+    if span > 90:
+        freq = 'W-MON'
+    if span > 730:
+        freq = 'ME'
+    periods = onb.dt.to_period(TREND_PERIOD_CODES[freq])
+    trend = periods.groupby(periods).size().reindex(
+        pd.period_range(periods.min(), periods.max(), freq=TREND_PERIOD_CODES[freq]), fill_value=0)
+    # Label each bin by its last day, as resample(freq) did
+    trend.index = trend.index.to_timestamp(how='end').normalize()
+    return tuple(trend.reset_index(name='count').itertuples(index=False, name=None)), freq
+
+@st.cache_data(show_spinner=False)
+def build_trend_chart(trend_points, freq):
+    trend = pd.DataFrame(list(trend_points), columns=['onboarding_datetime', 'count'])
+    line = px.line(
+        trend, x='onboarding_datetime', y='count', markers=True,
+        title=f"Onboardings Over Time ({freq} Trend)",
+        color_discrete_sequence=[ACTIVE_PLOTLY_PRIMARY_SEQ[0]]
+    )
+    line.update_layout(
+        PLOTLY_BASE_LAYOUT,
+        xaxis_title="Date", yaxis_title="Number of Onboardings"
+    )
+    return line
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_days_histogram(filter_sig, _vals):
+    # _vals is not hashed; filter_sig fully determines it.
+    n = len(_vals)
+    # At most 20 values in the small branch: a Python set beats pandas' unique machinery
+    nb = max(10, min(30, n // 5)) if n > 20 else (len(set(_vals.tolist())) or 10)
+    hist = px.histogram(
+        _vals, nbins=nb, title="Distribution of Days to Confirmation",
+        color_discrete_sequence=[ACTIVE_PLOTLY_PRIMARY_SEQ[1]]
+    )
+    hist.update_layout(
+        PLOTLY_BASE_LAYOUT,
+        xaxis_title="Days to Confirmation", yaxis_title="Frequency"
     )
+    return hist
 
 
 # ---------------- Global Search Dialog ----------------
+def close_global_search():
+    # Runs as an on_click callback: the record picker is keyed on
+    # selected_transcript_key_dialog_global_search, and widget-bound state can
+    # only be reset before the widget is drawn.
+    st.session_state.show_global_search_dialog = False
+    st.session_state.licenseNumber_search = ""
+    st.session_state.storeName_search = ""
+    st.session_state.selected_transcript_key_dialog_global_search = None
+    # Let the next search pre-select its single match again
+    st.session_state.pop("selected_transcript_key_dialog_global_search_auto_selected", None)
+
 if st.session_state.get('show_global_search_dialog', False) and global_search_active:
     @st.dialog("🔍 Global Search Results", width="large")
     def show_global_search_dialog_content():
@@ -1006,26 +1624,23 @@ if st.session_state.get('show_global_search_dialog', False) and global_search_ac
         if not df_global_search_results_display.empty:
             display_html_table_and_details(
                 df_global_search_results_display,
-                context_key_prefix="dialog_global_search"
+                context_key_prefix="dialog_global_search",
+                filter_sig=filter_signature
             )
         else:
             st.info("ℹ️ No results for global search. Try broadening terms.")
-        if st.button("Close & Clear Search"):
-            st.session_state.show_global_search_dialog = False
-            st.session_state.licenseNumber_search = ""
-            st.session_state.storeName_search = ""
-            if 'selected_transcript_key_dialog_global_search' in st.session_state:
-                st.session_state.selected_transcript_key_dialog_global_search = None
-            if "dialog_global_search_auto_selected_once" in st.session_state:
-                st.session_state.dialog_global_search_auto_selected_once = False
+        if st.button("Close & Clear Search", on_click=close_global_search):
             st.rerun()
 
     show_global_search_dialog_content()
 
 
 # ---------------- Tabs ----------------
-if st.session_state.active_tab == TAB_OVERVIEW:
+# st.tabs switches client-side, so changing tabs no longer costs a full script rerun.
+tab_overview, tab_detail, tab_trends = st.tabs(ALL_TABS)
+with tab_overview:
     st.header("📈 Month-to-Date (MTD) Performance")
+    total_mtd, sr_mtd, score_mtd, days_to_confirm_mtd, delta_onboardings_mtd = compute_mtd_metrics(st.session_state.data_version, date.today(), df_original)
     c = st.columns(4)
     with c[0]:
         st.metric(
@@ -1065,12 +1680,12 @@ if st.session_state.active_tab == TAB_OVERVIEW:
             unsafe_allow_html=True
         )
 
-elif st.session_state.active_tab == TAB_DETAILED_ANALYSIS:
+with tab_detail:
     st.header(TAB_DETAILED_ANALYSIS)
     if global_search_active:
         st.info("ℹ️ Global Search active. Results in pop-up. Close/clear search for category/date filters here.")
     else:
-        display_html_table_and_details(df_filtered, context_key_prefix="filtered_analysis")
+        display_html_table_and_details(df_filtered, context_key_prefix="filtered_analysis", filter_sig=filter_signature)
         st.divider()
         st.header("🎨 Key Visualizations (Filtered Data)")
         if not df_filtered.empty:
@@ -1079,87 +1694,47 @@ elif st.session_state.active_tab == TAB_DETAILED_ANALYSIS:
                 with colA:
                     # Status Distribution
                     if 'status' in df_filtered.columns and df_filtered['status'].notna().any():
-                        s_counts = (
-                            df_filtered['status']
-                            .astype(str)
-                            .str.replace(r"✅|⏳|❌", "", regex=True)
-                            .str.strip()
-                            .value_counts()
-                            .reset_index()
-                        )
-                        s_counts.columns = ['status', 'count']
-                        fig = px.bar(
-                            s_counts, x='status', y='count', color='status',
-                            title="Onboarding Status Distribution",
-                            color_discrete_sequence=ACTIVE_PLOTLY_PRIMARY_SEQ
+                        st.plotly_chart(
+                            build_status_chart(*category_counts(filter_signature, 'status', df_filtered)),
+                            use_container_width=True
                         )
-                        fig.update_layout(plotly_base_layout_settings)
-                        st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.markdown("<div class='no-data-message'>📉 Status data unavailable.</div>", unsafe_allow_html=True)
                     # Rep counts
                     if 'repName' in df_filtered.columns and df_filtered['repName'].notna().any():
-                        r_counts = df_filtered['repName'].value_counts().reset_index()
-                        r_counts.columns = ['repName', 'count']
-                        fig2 = px.bar(
-                            r_counts, x='repName', y='count', color='repName',
-                            title="Onboardings by Representative",
-                            color_discrete_sequence=ACTIVE_PLOTLY_QUALITATIVE_SEQ
-                        )
-                        fig2.update_layout(
-                            plotly_base_layout_settings,
-                            xaxis_title="Representative", yaxis_title="Number of Onboardings"
+                        st.plotly_chart(
+                            build_rep_chart(*category_counts(filter_signature, 'repName', df_filtered)),
+                            use_container_width=True
                         )
-                        st.plotly_chart(fig2, use_container_width=True)
                     else:
                         st.markdown("<div class='no-data-message'>👥 Rep data unavailable.</div>", unsafe_allow_html=True)
 
                 with colB:
                     # Sentiment
                     if 'clientSentiment' in df_filtered.columns and df_filtered['clientSentiment'].notna().any():
-                        sent = df_filtered['clientSentiment'].value_counts().reset_index()
-                        sent.columns = ['clientSentiment', 'count']
-                        cmap = {s.lower(): ACTIVE_PLOTLY_SENTIMENT_MAP.get(s.lower(), '#808080')
-                                for s in sent['clientSentiment'].unique()}
-                        pie = px.pie(
-                            sent, names='clientSentiment', values='count', hole=0.4,
-                            title="Client Sentiment Breakdown",
-                            color='clientSentiment', color_discrete_map=cmap
+                        st.plotly_chart(
+                            build_sentiment_chart(*category_counts(filter_signature, 'clientSentiment', df_filtered)),
+                            use_container_width=True
                         )
-                        pie.update_layout(plotly_base_layout_settings)
-                        pie.update_traces(textinfo='percent+label', textfont_size=12)
-                        st.plotly_chart(pie, use_container_width=True)
                     else:
                         st.markdown("<div class='no-data-message'>😊 Sentiment data unavailable.</div>", unsafe_allow_html=True)
 
                     # Key requirements (confirmed only)
-                    df_conf = df_filtered[df_filtered['status'].astype(str).str.contains('confirmed', case=False, na=False)].copy()
-                    key_cols = [c for c in ORDERED_CHART_REQUIREMENTS if c in df_conf.columns]
-                    if not df_conf.empty and key_cols:
-                        rows = []
-                        for c in key_cols:
-                            det = KEY_REQUIREMENT_DETAILS.get(c, {})
-                            label = det.get("chart_label", c.replace('_', ' ').title())
-                            raw = df_conf[c].astype(str).str.lower()
-                            val = raw.isin(['true', '1', 'yes', 'x', 'completed', 'done'])
-                            total = df_conf[c].notna().sum()
-                            trues = val.sum()
-                            if total > 0:
-                                rows.append({"Key Requirement": label, "Completion (%)": (trues / total) * 100})
+                    # Only the flag matrix is needed: count over the confirmed rows in place
+                    # rather than materializing a confirmed-only copy of the frame.
+                    confirmed = df_filtered['is_confirmed'].to_numpy()
+                    present = REQUIREMENT_FLAG_INDEX.isin(df_filtered.columns)
+                    key_cols = REQUIREMENT_INDEX[present]
+                    if confirmed.any() and len(key_cols):
+                        flags = df_filtered[REQUIREMENT_FLAG_INDEX[present]].to_numpy(dtype=np.uint8)
+                        true_ct, valid_ct = completion_kernel(flags, confirmed)
+                        rows = [
+                            (KEY_REQUIREMENT_DETAILS.get(c, {}).get("chart_label", c.replace('_', ' ').title()),
+                             float(100.0 * t / v))
+                            for c, t, v in zip(key_cols, true_ct, valid_ct) if v > 0
+                        ]
                         if rows:
-                            dplot = pd.DataFrame(rows)
-                            bar = px.bar(
-                                dplot.sort_values("Completion (%)", ascending=True),
-                                x="Completion (%)", y="Key Requirement", orientation='h',
-                                title="Key Req Completion (Confirmed Only)",
-                                color_discrete_sequence=[PRIMARY_COLOR_FOR_PLOTLY]
-                            )
-                            bar.update_layout(
-                                plotly_base_layout_settings,
-                                yaxis={'categoryorder': 'total ascending'},
-                                xaxis_ticksuffix="%"
-                            )
-                            st.plotly_chart(bar, use_container_width=True)
+                            st.plotly_chart(build_key_requirements_chart(tuple(rows)), use_container_width=True)
                         else:
                             st.markdown("<div class='no-data-message'>📊 No data for key req chart.</div>", unsafe_allow_html=True)
                     else:
@@ -1167,55 +1742,25 @@ elif st.session_state.active_tab == TAB_DETAILED_ANALYSIS:
         elif not df_original.empty:
             st.markdown("<div class='no-data-message'>🖼️ No data matches filters for visuals. 🖼️</div>", unsafe_allow_html=True)
 
-elif st.session_state.active_tab == TAB_TRENDS:
+with tab_trends:
     st.header(TAB_TRENDS)
     st.markdown(f"*(Visuals based on {'Global Search (Pop-Up)' if global_search_active else 'Filtered Data'})*")
     if not df_filtered.empty:
         # Trend over time
         if 'onboarding_date_only' in df_filtered.columns and df_filtered['onboarding_date_only'].notna().any():
-            src = df_filtered.copy()
-            src['onboarding_datetime'] = pd.to_datetime(src['onboarding_date_only'], errors='coerce')
-            src.dropna(subset=['onboarding_datetime'], inplace=True)
-            if not src.empty:
-                span = (src['onboarding_datetime'].max() - src['onboarding_datetime'].min()).days
-                freq = 'D'
-                if span > 90:
-                    freq = 'W-MON'
-                if span > 730:
-                    freq = 'ME'
-                trend = src.set_index('onboarding_datetime').resample(freq).size().reset_index(name='count')
-                if not trend.empty:
-                    line = px.line(
-                        trend, x='onboarding_datetime', y='count', markers=True,
-                        title=f"Onboardings Over Time ({freq} Trend)",
-                        color_discrete_sequence=[ACTIVE_PLOTLY_PRIMARY_SEQ[0]]
-                    )
-                    line.update_layout(
-                        plotly_base_layout_settings,
-                        xaxis_title="Date", yaxis_title="Number of Onboardings"
-                    )
-                    st.plotly_chart(line, use_container_width=True)
-                else:
-                    st.markdown("<div class='no-data-message'>📈 Not enough data for trend plot.</div>", unsafe_allow_html=True)
+            trend_points, freq = trend_counts(filter_signature, df_filtered['onboarding_date_only'])
+            if trend_points:
+                st.plotly_chart(build_trend_chart(trend_points, freq), use_container_width=True)
             else:
-                st.markdown("<div class='no-data-message'>📅 No valid date data for trend.</div>", unsafe_allow_html=True)
+                st.markdown("<div class='no-data-message'>📈 Not enough data for trend plot.</div>", unsafe_allow_html=True)
         else:
             st.markdown("<div class='no-data-message'>🗓️ 'onboarding_date_only' missing for trend.</div>", unsafe_allow_html=True)
 
         # Days to confirmation histogram
         if 'days_to_confirmation' in df_filtered.columns and df_filtered['days_to_confirmation'].notna().any():
-            vals = pd.to_numeric(df_filtered['days_to_confirmation'], errors='coerce').dropna()
+            vals = df_filtered['days_to_confirmation'].dropna()  # numeric since load
             if not vals.empty:
-                nb = max(10, min(30, int(len(vals) / 5))) if len(vals) > 20 else (len(vals.unique()) or 10)
-                hist = px.histogram(
-                    vals, nbins=nb, title="Distribution of Days to Confirmation",
-                    color_discrete_sequence=[ACTIVE_PLOTLY_PRIMARY_SEQ[1]]
-                )
-                hist.update_layout(
-                    plotly_base_layout_settings,
-                    xaxis_title="Days to Confirmation", yaxis_title="Frequency"
-                )
-                st.plotly_chart(hist, use_container_width=True)
+                st.plotly_chart(build_days_histogram(filter_signature, vals), use_container_width=True)
             else:
                 st.markdown("<div class='no-data-message'>⏳ No 'Days to Confirmation' data.</div>", unsafe_allow_html=True)
         else:
@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_helpers import (REQUIREMENT_FLAG_BLANK, category_mask_kernel, category_mask_numpy,
+                               completion_kernel, completion_numpy, convert_df_to_csv,
+                               convert_df_to_parquet, metrics_kernel, metrics_numpy)
+
+
+def results_frame():
+    df = pd.DataFrame({
+        "storeName": pd.Series(["Store A", "Store B"], dtype="category"),
+        "licenseNumber": pd.Series(["C10-1", "C10-2"], dtype="string[pyarrow]"),
+        "score": pd.Series([8.5, None], dtype="float32"),
+    })
+    # A slice of the loaded frame carries whatever the loader left in attrs
+    df.attrs = {"onboarding_min": date(2024, 1, 2), "onboarding_max": date(2024, 3, 4), "has_dates": True}
+    return df
+
+
+def test_parquet_download_round_trips_despite_non_json_attrs():
+    df = results_frame()
+    out = pd.read_parquet(io.BytesIO(convert_df_to_parquet(df)))
+    assert out["licenseNumber"].tolist() == ["C10-1", "C10-2"]
+    assert out["storeName"].astype(str).tolist() == ["Store A", "Store B"]
+    assert out.attrs == {}
+    # The caller's frame keeps its metadata
+    assert df.attrs["onboarding_min"] == date(2024, 1, 2)
+
+
+def test_csv_download_writes_header_and_rows():
+    text = convert_df_to_csv(results_frame()).decode("utf-8")
+    lines = text.strip().splitlines()
+    assert len(lines) == 3
+    assert "licenseNumber" in lines[0]
+    assert "C10-1" in lines[1]
+
+
+def test_metrics_kernel_matches_numpy():
+    confirmed = np.array([True, False, True, True])
+    score = np.array([8.0, np.nan, 6.0, 10.0])
+    days = np.array([1.0, 2.0, np.nan, np.nan])
+    assert np.allclose(metrics_kernel(confirmed, score, days), metrics_numpy(confirmed, score, days))
+    assert np.allclose(metrics_kernel(confirmed, score, days), (4, 75.0, 8.0, 1.5))
+
+
+def test_completion_kernel_counts_met_and_non_blank_confirmed_rows():
+    flags = np.array([[1, 0], [1, REQUIREMENT_FLAG_BLANK], [0, 1]], dtype=np.uint8)
+    confirmed = np.array([True, True, False])
+    met, valid = completion_kernel(flags, confirmed)
+    assert met.tolist() == [2, 0] and valid.tolist() == [2, 1]
+    assert [a.tolist() for a in completion_numpy(flags, confirmed)] == [[2, 0], [2, 1]]
+
+
+def test_category_mask_kernel_matches_numpy():
+    # Two filters; code -1 (missing) maps to bits column 0 and is never selected
+    codes = np.array([[0, 1], [1, 1], [-1, 0], [2, -1]], dtype=np.int32)
+    bits = np.array([[0, 1, 1, 0], [0, 0, 1, 0]], dtype=np.uint8)
+    expected = [True, True, False, False]
+    assert category_mask_kernel(codes, bits, np.ones(4, dtype=bool)).tolist() == expected
+    assert category_mask_numpy(codes, bits, np.ones(4, dtype=bool)).tolist() == expected